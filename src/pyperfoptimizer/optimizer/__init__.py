@@ -5,8 +5,8 @@ This module provides tools for analyzing and optimizing Python code
 based on profiling results.
 """
 
-from pyperfoptimizer.optimizer.code_analyzer import CodeAnalyzer
+from pyperfoptimizer.optimizer.code_analyzer import CodeAnalyzer, IssueType
 from pyperfoptimizer.optimizer.optimizations import Optimizations
-from pyperfoptimizer.optimizer.recommendations import Recommendations
+from pyperfoptimizer.optimizer.recommendations import Recommendation, Recommendations
 
-__all__ = ['CodeAnalyzer', 'Recommendations', 'Optimizations']
+__all__ = ['CodeAnalyzer', 'IssueType', 'Recommendation', 'Recommendations', 'Optimizations']
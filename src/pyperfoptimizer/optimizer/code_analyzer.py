@@ -7,11 +7,86 @@ potential performance issues and optimization opportunities.
 
 import ast
 import builtins
+import functools
 import inspect
 import os
+import pickle
 import re
 import textwrap
-from typing import Callable, Dict, List, Optional
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum, auto
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+
+class IssueType(IntEnum):
+    """Kinds of issues reported by the code analyzer."""
+    ANALYSIS_ERROR = auto()
+    SYNTAX_ERROR = auto()
+    MUTABLE_DEFAULT_ARG = auto()
+    LEN_IN_LOOP = auto()
+    SORTED_IN_LOOP = auto()
+    RANGE_LEN = auto()
+    GLOBAL_VARIABLES = auto()
+    REPEATED_LEN_IN_LOOP = auto()
+    LIST_OF_RANGE = auto()
+    STRING_CONCAT_IN_LOOP = auto()
+
+
+# Module-level names treated as global variables
+_GLOBAL_NAME_RE = re.compile(r'[A-Z_][A-Z0-9_]*')
+
+# Visitor attributes copied into the analyzer after a tree walk
+_VISITOR_RESULTS = (
+    'imported_modules',
+    'used_builtins',
+    'defined_functions',
+    'called_functions',
+    'comprehensions',
+    'loops',
+    'conditionals',
+    'exception_handling',
+    'data_structures',
+    'issues',
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_and_visit(code: str, module_name: Optional[str] = None) -> 'CodeVisitor':
+    """
+    Parse source code and walk it with a CodeVisitor.
+    
+    Results are cached per source string, so repeated analyses of the same
+    code skip both parsing and the tree walk. The returned visitor is shared
+    between callers; use CodeAnalyzer._collect_visitor_results to read it.
+    
+    Args:
+        code: The source code to analyze
+        module_name: Name of the module containing the code
+        
+    Returns:
+        The visitor holding the analysis results
+    """
+    # Compile straight to an AST; dont_inherit keeps our own __future__
+    # flags out of the analyzed code
+    tree = compile(code, module_name or '<string>', 'exec',
+                   flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+    visitor = CodeVisitor(module_name)
+    visitor.visit(tree)
+    return visitor
+
+
+def _analyze_one(filename: str) -> Dict:
+    """
+    Analyze a single file with a fresh analyzer (worker entry point).
+    
+    Args:
+        filename: Path to the Python file to analyze
+        
+    Returns:
+        Dictionary containing analysis results
+    """
+    return CodeAnalyzer().analyze_file(filename)
 
 
 class CodeAnalyzer:
@@ -26,6 +101,7 @@ class CodeAnalyzer:
     def __init__(self):
         """Initialize the code analyzer."""
         self.issues = []
+        self.issues_by_type = defaultdict(list)
         self.imported_modules = set()
         self.used_builtins = set()
         self.defined_functions = {}
@@ -45,6 +121,16 @@ class CodeAnalyzer:
         """Reset the analyzer state."""
         self.__init__()
         
+    def _add_issue(self, issue: Dict) -> None:
+        """
+        Record an issue and index it by its type.
+        
+        Args:
+            issue: Issue dictionary with 'type', 'severity' and 'message' keys
+        """
+        self.issues.append(issue)
+        self.issues_by_type[issue['type']].append(issue)
+        
     def analyze_function(self, func: Callable) -> Dict:
         """
         Analyze a function for optimization opportunities.
@@ -59,7 +145,8 @@ class CodeAnalyzer:
         try:
             source = textwrap.dedent(inspect.getsource(func))
         except (IOError, TypeError):
-            self.issues.append({
+            self._add_issue({
+                'type': IssueType.ANALYSIS_ERROR,
                 'severity': 'error',
                 'message': f"Could not retrieve source code for {func.__name__}"
             })
@@ -86,19 +173,14 @@ class CodeAnalyzer:
         self.reset()
         
         try:
-            # Parse the code into an AST
-            tree = ast.parse(code)
-            
-            # Analyze the AST
-            self._analyze_ast(tree, module_name)
-            
-            # Check for specific patterns
-            self._check_for_patterns(code)
+            # Parse and analyze the AST (cached for previously seen code)
+            self._collect_visitor_results(_parse_and_visit(code, module_name))
             
             # Get the results
             return self._get_results()
         except SyntaxError as e:
-            self.issues.append({
+            self._add_issue({
+                'type': IssueType.SYNTAX_ERROR,
                 'severity': 'error',
                 'message': f"Syntax error in code: {str(e)}"
             })
@@ -115,7 +197,8 @@ class CodeAnalyzer:
             Dictionary containing analysis results
         """
         if not os.path.exists(filename):
-            self.issues.append({
+            self._add_issue({
+                'type': IssueType.ANALYSIS_ERROR,
                 'severity': 'error',
                 'message': f"File {filename} does not exist"
             })
@@ -130,77 +213,61 @@ class CodeAnalyzer:
             
             return self.analyze_code(code, module_name)
         except Exception as e:
-            self.issues.append({
+            self._add_issue({
+                'type': IssueType.ANALYSIS_ERROR,
                 'severity': 'error',
                 'message': f"Error analyzing file {filename}: {str(e)}"
             })
             return self._get_results()
             
-    def _analyze_ast(self, tree: ast.AST, module_name: Optional[str] = None) -> None:
+    @classmethod
+    def analyze_files(cls, filenames: Sequence[str], workers: Optional[int] = None) -> Dict[str, Dict]:
         """
-        Analyze an AST for optimization opportunities.
+        Analyze several Python files in parallel worker processes.
+        
+        Analysis is CPU-bound pure Python, so files are spread across
+        processes rather than threads.
         
         Args:
-            tree: The AST to analyze
-            module_name: Name of the module containing the code
+            filenames: Paths to the Python files to analyze
+            workers: Maximum number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Dictionary mapping each filename to its analysis results
         """
-        # Create a visitor to analyze the AST
-        visitor = CodeVisitor(module_name)
-        visitor.visit(tree)
-        
-        # Collect analysis results
-        self.imported_modules = visitor.imported_modules
-        self.used_builtins = visitor.used_builtins
-        self.defined_functions = visitor.defined_functions
-        self.called_functions = visitor.called_functions
-        self.comprehensions = visitor.comprehensions
-        self.loops = visitor.loops
-        self.conditionals = visitor.conditionals
-        self.exception_handling = visitor.exception_handling
-        self.data_structures = visitor.data_structures
-        
-        # Collect issues found during AST analysis
-        self.issues.extend(visitor.issues)
-        
-    def _check_for_patterns(self, code: str) -> None:
+        filenames = list(filenames)
+        if len(filenames) <= 1 or workers == 1:
+            return {filename: _analyze_one(filename) for filename in filenames}
+            
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Send files in batches to amortize inter-process overhead
+            results = executor.map(_analyze_one, filenames, chunksize=8)
+            return dict(zip(filenames, results))
+            
+    def _collect_visitor_results(self, visitor: 'CodeVisitor') -> None:
         """
-        Check for specific patterns in the code that may indicate issues.
+        Collect analysis results from a visitor that has walked an AST.
+        
+        The first analysis of new code takes the visitor's own results and
+        leaves a pickled snapshot behind; only later analyses that reuse the
+        cached visitor pay for a copy, restored from that snapshot.
         
         Args:
-            code: The source code to analyze
+            visitor: The visitor holding the analysis results
         """
-        # Check for global variables
-        global_pattern = r'^[A-Z_][A-Z0-9_]*\s*='
-        if re.search(global_pattern, code, re.MULTILINE):
-            self.issues.append({
-                'severity': 'warning',
-                'message': "Global variables detected. Consider encapsulating in functions or classes."
-            })
-            
-        # Check for multiple calls to len() in loops
-        len_in_loop_pattern = r'for\s+.*\s+in\s+.*:\s*.*len\('
-        if re.search(len_in_loop_pattern, code):
-            self.issues.append({
-                'severity': 'warning',
-                'message': "Multiple calls to len() in loop. Calculate length once before the loop."
-            })
-            
-        # Check for unnecessary list conversions
-        list_conv_pattern = r'list\(\s*range\('
-        if re.search(list_conv_pattern, code):
-            self.issues.append({
-                'severity': 'info',
-                'message': "Unnecessary list conversion of range(). Use range directly in Python 3."
-            })
-            
-        # Check for inefficient string concatenation in loops
-        str_concat_pattern = r'for\s+.*\s+in\s+.*:\s*.*\s*\+='
-        if re.search(str_concat_pattern, code):
-            self.issues.append({
-                'severity': 'warning',
-                'message': "String concatenation in a loop. Use ''.join() or a list comprehension instead."
-            })
+        if visitor._snapshot is None:
+            results = {attr: getattr(visitor, attr) for attr in _VISITOR_RESULTS}
+            visitor._snapshot = pickle.dumps(results, pickle.HIGHEST_PROTOCOL)
+        else:
+            results = pickle.loads(visitor._snapshot)
             
+        # Collect issues found during AST analysis
+        for issue in results.pop('issues'):
+            self._add_issue(issue)
+        
+        for attr, value in results.items():
+            setattr(self, attr, value)
+        
     def _get_results(self) -> Dict:
         """
         Get the analysis results.
@@ -230,6 +297,7 @@ class CodeAnalyzer:
         # Prepare the results
         results = {
             'issues': self.issues,
+            'issues_by_type': dict(self.issues_by_type),
             'issue_counts': issue_counts,
             'construct_counts': construct_counts,
             'imported_modules': list(self.imported_modules),
@@ -245,10 +313,13 @@ class CodeAnalyzer:
         
         return results
         
-    def get_optimization_opportunities(self) -> List[Dict]:
+    def get_optimization_opportunities(self, issue_types: Optional[Iterable[IssueType]] = None) -> List[Dict]:
         """
         Get a list of optimization opportunities based on the analysis.
         
+        Args:
+            issue_types: Issue types to include as opportunities (defaults to all)
+            
         Returns:
             List of dictionaries containing optimization opportunities
         """
@@ -287,8 +358,13 @@ class CodeAnalyzer:
                 'line': func_info.get('line')
             })
             
-        # Include all issues as opportunities
-        for issue in self.issues:
+        # Include the requested issues as opportunities
+        if issue_types is None:
+            issues = self.issues
+        else:
+            issues = [issue for issue_type in issue_types for issue in self.issues_by_type.get(issue_type, ())]
+            
+        for issue in issues:
             opportunities.append({
                 'type': 'issue',
                 'severity': issue.get('severity', 'info'),
@@ -302,6 +378,11 @@ class CodeAnalyzer:
 class CodeVisitor(ast.NodeVisitor):
     """
     A visitor that analyzes Python AST nodes to detect optimization opportunities.
+    
+    The tree is walked iteratively, dispatching on the node class through a
+    precomputed table. A handler may return a callback that runs once all of
+    the node's children have been visited, which is used to restore state
+    such as the loop depth or the enclosing function.
     """
     
     def __init__(self, module_name: Optional[str] = None):
@@ -329,23 +410,116 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.current_function = None
         self.loop_depth = 0
+        # Names bound to strings in the current function (or module)
+        self._string_names = set()
+        # Issue types reported at most once per analysis
+        self._reported = set()
+        # Pickled results kept once the visitor is cached and handed out
+        self._snapshot = None
+        self._dispatch = {
+            ast.Module: self.visit_Module,
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.Call: self.visit_Call,
+            ast.For: self.visit_For,
+            ast.While: self.visit_While,
+            ast.Assign: self.visit_Assign,
+            ast.AnnAssign: self.visit_AnnAssign,
+            ast.AugAssign: self.visit_AugAssign,
+            ast.If: self.visit_If,
+            ast.Try: self.visit_Try,
+            ast.ListComp: self.visit_ListComp,
+            ast.DictComp: self.visit_DictComp,
+            ast.SetComp: self.visit_SetComp,
+            ast.GeneratorExp: self.visit_GeneratorExp,
+            ast.List: self.visit_List,
+            ast.Dict: self.visit_Dict,
+            ast.Set: self.visit_Set,
+            ast.Tuple: self.visit_Tuple,
+        }
+        
+    def visit(self, node: ast.AST) -> None:
+        """
+        Visit a tree of nodes in source order.
         
+        Args:
+            node: Root of the tree to visit
+        """
+        dispatch = self._dispatch
+        stack = deque([node])
+        
+        while stack:
+            item = stack.pop()
+            
+            # Exit callbacks are stored below the children of their node
+            if not isinstance(item, ast.AST):
+                item()
+                continue
+                
+            handler = dispatch.get(item.__class__)
+            if handler is not None:
+                on_exit = handler(item)
+                if on_exit is not None:
+                    stack.append(on_exit)
+                    
+            # Push children reversed so they are popped in source order
+            stack.extend(reversed(list(ast.iter_child_nodes(item))))
+            
+    def _report_once(self, issue_type: IssueType, severity: str, message: str, line: int) -> None:
+        """
+        Record an issue unless one of the same type was already reported.
+        
+        Args:
+            issue_type: Type of the issue
+            severity: Issue severity ('error', 'warning' or 'info')
+            message: Description of the issue
+            line: Line of the first occurrence
+        """
+        if issue_type in self._reported:
+            return
+        self._reported.add(issue_type)
+        self.issues.append({
+            'type': issue_type,
+            'severity': severity,
+            'message': message,
+            'line': line
+        })
+        
+    def visit_Module(self, node: ast.Module) -> None:
+        """Visit a Module node."""
+        # Check for global variables assigned at module level
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign):
+                targets = stmt.targets
+            elif isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+                targets = [stmt.target]
+            else:
+                continue
+            if any(isinstance(t, ast.Name) and _GLOBAL_NAME_RE.fullmatch(t.id) for t in targets):
+                self._report_once(
+                    IssueType.GLOBAL_VARIABLES, 'warning',
+                    "Global variables detected. Consider encapsulating in functions or classes.",
+                    stmt.lineno
+                )
+                break
+                
     def visit_Import(self, node: ast.Import) -> None:
         """Visit an Import node."""
         for name in node.names:
             self.imported_modules.add(name.name)
-        self.generic_visit(node)
         
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Visit an ImportFrom node."""
         if node.module:
             self.imported_modules.add(node.module)
-        self.generic_visit(node)
         
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> Callable[[], None]:
         """Visit a FunctionDef node."""
         old_function = self.current_function
+        old_string_names = self._string_names
         self.current_function = node.name
+        self._string_names = set()
         
         # Store information about the function
         self.defined_functions[node.name] = {
@@ -360,16 +534,18 @@ class CodeVisitor(ast.NodeVisitor):
             for default in node.args.defaults:
                 if isinstance(default, (ast.List, ast.Dict, ast.Set)):
                     self.issues.append({
+                        'type': IssueType.MUTABLE_DEFAULT_ARG,
                         'severity': 'warning',
                         'message': f"Mutable default argument in function '{node.name}' at line {node.lineno}",
                         'line': node.lineno
                     })
                     
-        # Analyze function body
-        self.generic_visit(node)
-        
-        # Restore previous function
-        self.current_function = old_function
+        # Restore previous function once the body has been visited
+        def restore_function() -> None:
+            self.current_function = old_function
+            self._string_names = old_string_names
+            
+        return restore_function
         
     def visit_Call(self, node: ast.Call) -> None:
         """Visit a Call node."""
@@ -380,6 +556,15 @@ class CodeVisitor(ast.NodeVisitor):
         if func_name:
             self.called_functions.add(func_name)
             
+            # Check for unnecessary list conversions
+            if (func_name == 'list' and node.args and isinstance(node.args[0], ast.Call) and
+                self._get_call_name(node.args[0].func) == 'range'):
+                self._report_once(
+                    IssueType.LIST_OF_RANGE, 'info',
+                    "Unnecessary list conversion of range(). Use range directly in Python 3.",
+                    node.lineno
+                )
+            
             # Check for built-in functions
             if hasattr(builtins, func_name):
                 self.used_builtins.add(func_name)
@@ -387,34 +572,38 @@ class CodeVisitor(ast.NodeVisitor):
                 # Check for inefficient built-in usage
                 if func_name == 'len' and self.loop_depth > 0:
                     self.issues.append({
+                        'type': IssueType.LEN_IN_LOOP,
                         'severity': 'warning',
                         'message': f"Call to len() inside a loop at line {node.lineno}. Calculate length once before loop.",
                         'line': node.lineno
                     })
+                    self._report_once(
+                        IssueType.REPEATED_LEN_IN_LOOP, 'warning',
+                        "Multiple calls to len() in loop. Calculate length once before the loop.",
+                        node.lineno
+                    )
                 elif func_name == 'sorted' and self.loop_depth > 0:
                     self.issues.append({
+                        'type': IssueType.SORTED_IN_LOOP,
                         'severity': 'warning',
                         'message': f"Call to sorted() inside a loop at line {node.lineno}. Sort once before loop if possible.",
                         'line': node.lineno
                     })
                     
-        # Analyze call arguments
-        self.generic_visit(node)
-        
-    def visit_For(self, node: ast.For) -> None:
+    def visit_For(self, node: ast.For) -> Callable[[], None]:
         """Visit a For node."""
-        # Increment loop depth
-        self.loop_depth += 1
-        
         # Record loop information
         loop_info = {
             'line': node.lineno,
-            'nested': self.loop_depth > 1,
+            'nested': self.loop_depth > 0,
             'target_type': self._get_node_type(node.target),
             'iter_type': self._get_node_type(node.iter)
         }
         self.loops.append(loop_info)
         
+        # Increment loop depth for the loop body
+        self.loop_depth += 1
+        
         # Check for specific loop patterns
         iter_name = self._get_call_name(node.iter.func) if isinstance(node.iter, ast.Call) else None
         if iter_name == 'range' and isinstance(node.iter, ast.Call) and len(node.iter.args) == 1:
@@ -422,36 +611,76 @@ class CodeVisitor(ast.NodeVisitor):
             if (isinstance(node.iter.args[0], ast.Call) and 
                 self._get_call_name(node.iter.args[0].func) == 'len'):
                 self.issues.append({
+                    'type': IssueType.RANGE_LEN,
                     'severity': 'info',
                     'message': f"range(len(...)) at line {node.lineno}. Consider using enumerate() for cleaner code.",
                     'line': node.lineno
                 })
                 
-        # Analyze loop body
-        self.generic_visit(node)
-        
-        # Decrement loop depth
-        self.loop_depth -= 1
+        # Decrement loop depth once the loop body has been visited
+        return self._leave_loop
         
-    def visit_While(self, node: ast.While) -> None:
+    def visit_While(self, node: ast.While) -> Callable[[], None]:
         """Visit a While node."""
-        # Increment loop depth
-        self.loop_depth += 1
-        
         # Record loop information
         loop_info = {
             'line': node.lineno,
-            'nested': self.loop_depth > 1,
+            'nested': self.loop_depth > 0,
             'test_type': self._get_node_type(node.test)
         }
         self.loops.append(loop_info)
         
-        # Analyze loop body
-        self.generic_visit(node)
+        # Increment loop depth for the loop body
+        self.loop_depth += 1
+        
+        # Decrement loop depth once the loop body has been visited
+        return self._leave_loop
         
-        # Decrement loop depth
+    def _leave_loop(self) -> None:
+        """Leave a loop after its body has been visited."""
         self.loop_depth -= 1
         
+    def _is_string(self, node: ast.AST) -> bool:
+        """Return whether an expression evidently evaluates to a string."""
+        if isinstance(node, ast.Constant):
+            return isinstance(node.value, str)
+        if isinstance(node, ast.JoinedStr):
+            return True
+        if isinstance(node, ast.Name):
+            return node.id in self._string_names
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            return self._is_string(node.left) or self._is_string(node.right)
+        return False
+        
+    def _bind_names(self, targets: List[ast.AST], value: Optional[ast.AST]) -> None:
+        """Track which plain names are bound to strings."""
+        is_string = value is not None and self._is_string(value)
+        for target in targets:
+            if isinstance(target, ast.Name):
+                if is_string:
+                    self._string_names.add(target.id)
+                else:
+                    self._string_names.discard(target.id)
+                    
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """Visit an Assign node."""
+        self._bind_names(node.targets, node.value)
+        
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        """Visit an AnnAssign node."""
+        self._bind_names([node.target], node.value)
+        
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        """Visit an AugAssign node."""
+        # Check for inefficient string concatenation in loops
+        if (isinstance(node.op, ast.Add) and self.loop_depth > 0
+                and (self._is_string(node.value) or self._is_string(node.target))):
+            self._report_once(
+                IssueType.STRING_CONCAT_IN_LOOP, 'warning',
+                "String concatenation in a loop. Use ''.join() or a list comprehension instead.",
+                node.lineno
+            )
+            
     def visit_If(self, node: ast.If) -> None:
         """Visit an If node."""
         # Record conditional information
@@ -462,9 +691,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.conditionals.append(cond_info)
         
-        # Analyze the If statement and its blocks
-        self.generic_visit(node)
-        
     def visit_Try(self, node: ast.Try) -> None:
         """Visit a Try node."""
         # Record exception handling information
@@ -476,9 +702,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.exception_handling.append(ex_info)
         
-        # Analyze the Try block and its handlers
-        self.generic_visit(node)
-        
     def visit_ListComp(self, node: ast.ListComp) -> None:
         """Visit a ListComp node."""
         # Record list comprehension information
@@ -496,9 +719,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.data_structures['lists'].append(list_info)
         
-        # Analyze the comprehension
-        self.generic_visit(node)
-        
     def visit_DictComp(self, node: ast.DictComp) -> None:
         """Visit a DictComp node."""
         # Record dict comprehension information
@@ -516,9 +736,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.data_structures['dicts'].append(dict_info)
         
-        # Analyze the comprehension
-        self.generic_visit(node)
-        
     def visit_SetComp(self, node: ast.SetComp) -> None:
         """Visit a SetComp node."""
         # Record set comprehension information
@@ -536,9 +753,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.data_structures['sets'].append(set_info)
         
-        # Analyze the comprehension
-        self.generic_visit(node)
-        
     def visit_GeneratorExp(self, node: ast.GeneratorExp) -> None:
         """Visit a GeneratorExp node."""
         # Record generator expression information
@@ -549,9 +763,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.comprehensions.append(comp_info)
         
-        # Analyze the generator expression
-        self.generic_visit(node)
-        
     def visit_List(self, node: ast.List) -> None:
         """Visit a List node."""
         # Record list information
@@ -562,9 +773,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.data_structures['lists'].append(list_info)
         
-        # Analyze the list elements
-        self.generic_visit(node)
-        
     def visit_Dict(self, node: ast.Dict) -> None:
         """Visit a Dict node."""
         # Record dict information
@@ -575,9 +783,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.data_structures['dicts'].append(dict_info)
         
-        # Analyze the dict elements
-        self.generic_visit(node)
-        
     def visit_Set(self, node: ast.Set) -> None:
         """Visit a Set node."""
         # Record set information
@@ -588,9 +793,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.data_structures['sets'].append(set_info)
         
-        # Analyze the set elements
-        self.generic_visit(node)
-        
     def visit_Tuple(self, node: ast.Tuple) -> None:
         """Visit a Tuple node."""
         # Record tuple information
@@ -600,9 +802,6 @@ class CodeVisitor(ast.NodeVisitor):
         }
         self.data_structures['tuples'].append(tuple_info)
         
-        # Analyze the tuple elements
-        self.generic_visit(node)
-        
     def _get_call_name(self, node: ast.AST) -> Optional[str]:
         """
         Get the name of a function call.
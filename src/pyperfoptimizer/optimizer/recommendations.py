@@ -5,8 +5,124 @@ This module provides tools for generating optimization recommendations
 based on profiling results and code analysis.
 """
 
+import heapq
 import re
-from typing import Dict, List, Optional
+import sys
+import time
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+def _select_hotspots(percentages: np.ndarray, threshold: float, k: int) -> np.ndarray:
+    """
+    Select the indices of the top k lines above a time percentage threshold.
+    
+    Args:
+        percentages: Percentage of function time spent on each line
+        threshold: Minimum percentage for a line to count as a hotspot
+        k: Maximum number of hotspots to return
+        
+    Returns:
+        Indices into percentages, highest percentage first
+    """
+    # A stable sort keeps lines with equal percentages in their original order
+    order = np.argsort(-percentages, kind='mergesort')
+    order = order[percentages[order] > threshold]
+    return order[:k]
+
+
+# Recommendation categories, interned since every record carries one
+CAT_CPU = sys.intern('cpu')
+CAT_MEM = sys.intern('memory')
+CAT_ALGO = sys.intern('algorithm')
+CAT_CODE = sys.intern('code_structure')
+
+# Function-name classifiers applied to CPU hotspots: (tag, pattern, template)
+_FUNCTION_CLASSIFIERS = (
+    ('sort', re.compile(r'sort|order', re.IGNORECASE),
+     "Function {function} may involve sorting. "
+     "Use appropriate sorting algorithm and consider the sorted() key parameter.".format_map),
+    ('io', re.compile(r'read|write|load|save|file|open', re.IGNORECASE),
+     "Function {function} may involve I/O operations. "
+     "Consider buffering, asynchronous I/O, or batching operations.".format_map),
+    ('string', re.compile(r'str|join|split|format', re.IGNORECASE),
+     "Function {function} may involve string operations. "
+     "Use ''.join() for concatenation and consider f-strings for formatting.".format_map),
+)
+
+# Line-content patterns for line profile hotspots
+_LOOP_RE = re.compile(r'for\s+.*\s+in\s+')
+_MEMBERSHIP_RE = re.compile(r'if\s+.*\s+in\s+')
+_STRING_CONCAT_RE = re.compile(r'[\'"]\s*\+')
+_LIST_MODIFY_RE = re.compile(r'\.\s*(?:append|extend|insert)')
+_BUILTIN_CALL_RE = re.compile(r'(?:sum|min|max|sorted|list|set|dict)\s*\(')
+
+# CPU analyses are only memoized when they took longer than this (seconds),
+# and at most this many are kept
+_CPU_CACHE_MIN_SECONDS = 512e-6
+_CPU_CACHE_SIZE = 32
+
+# A memory trace that never shrinks is only reported as steady growth when
+# it grows at least this much in total (MB) and this fast (MB/s)
+_STEADY_GROWTH_MIN_MB = 10.0
+_STEADY_GROWTH_MIN_RATE = 1.0
+
+# Priority of recommendations generated from code analysis issues
+_SEVERITY_PRIORITY = {'error': 3, 'warning': 2, 'info': 1}
+
+
+class _TemplateFields:
+    """Read-only view of a record for str.format_map, filling missing fields with 'unknown'."""
+    __slots__ = ('_record',)
+    
+    def __init__(self, record: Mapping):
+        self._record = record
+        
+    def __getitem__(self, key: str):
+        return self._record.get(key, 'unknown')
+
+
+def _analyze_function(func: Mapping, classify: bool) -> List[Tuple[str, str, int]]:
+    """
+    Produce the CPU findings for a single function.
+    
+    Args:
+        func: Function statistics (FuncStat or dictionary)
+        classify: Whether to classify the function by name (done for hotspots)
+        
+    Returns:
+        List of (text, tag, priority) findings
+    """
+    findings = []
+    fields = _TemplateFields(func)
+    
+    # Check for recursive functions
+    if '/' in str(func.get('ncalls', '')):
+        findings.append((Recommendations._TPL_RECURSIVE(fields), 'recursion', 2))
+        
+    # Classify the function by name
+    if classify:
+        func_name = func.get('function', '')
+        for tag, pattern, template in _FUNCTION_CLASSIFIERS:
+            if pattern.search(func_name):
+                findings.append((template(fields), tag, 2))
+                
+    return findings
+
+
+@dataclass(slots=True, frozen=True)
+class Recommendation:
+    """A single optimization recommendation, classified when it is created."""
+    text: str
+    category: str
+    tags: FrozenSet[str] = frozenset()
+    priority: int = 1
+    
+    def __str__(self) -> str:
+        return self.text
 
 
 class Recommendations:
@@ -17,18 +133,49 @@ class Recommendations:
     recommendations for improving performance.
     """
     
+    # Message templates filled from function statistics or profile data
+    _TPL_TOP_FUNCTION = "Focus optimization efforts on top time-consuming function: {function}".format_map
+    _TPL_RECURSIVE = ("Function {function} is recursive. "
+                      "Consider an iterative approach or memoization if it recalculates the same values.").format_map
+    _TPL_SLOW = ("Total execution time ({total_time:.2f}s) is high. "
+                 "Consider parallelizing or optimizing the most expensive operations.").format_map
+    
     def __init__(self):
         """Initialize the recommendations generator."""
-        self.recommendations = {
-            'cpu': [],
-            'memory': [],
-            'algorithm': [],
-            'code_structure': []
-        }
+        # Memoized CPU analyses, kept across resets
+        self._cpu_cache = {}
+        self.reset()
         
     def reset(self) -> None:
         """Reset the recommendations."""
-        self.__init__()
+        self.recommendations = {
+            CAT_CPU: [],
+            CAT_MEM: [],
+            CAT_ALGO: [],
+            CAT_CODE: []
+        }
+        # Structured form of the recommendations above, by category
+        self.records = {category: [] for category in self.recommendations}
+        
+    def _record(self, 
+               category: str, 
+               text: str, 
+               tags: Iterable[str] = (), 
+               priority: int = 1) -> str:
+        """
+        Record a classified recommendation.
+        
+        Args:
+            category: Recommendation category
+            text: Recommendation text
+            tags: Tags classifying the recommendation
+            priority: Higher values are listed first when prioritizing
+            
+        Returns:
+            The recommendation text
+        """
+        self.records[category].append(Recommendation(text, category, frozenset(map(sys.intern, tags)), priority))
+        return text
         
     def generate_from_cpu_profile(self, cpu_data: Dict) -> List[str]:
         """
@@ -41,65 +188,77 @@ class Recommendations:
             List of CPU optimization recommendations
         """
         recommendations = []
+        self.records[CAT_CPU] = []
         
         # Check if we have function data
         if not cpu_data or 'functions' not in cpu_data or not cpu_data['functions']:
-            recommendations.append(
-                "No CPU profiling data available. Run a CPU profile to get recommendations."
-            )
-            self.recommendations['cpu'] = recommendations
+            recommendations.append(self._record(
+                CAT_CPU,
+                "No CPU profiling data available. Run a CPU profile to get recommendations.",
+                tags=('no_data',), priority=0
+            ))
+            self.recommendations[CAT_CPU] = recommendations
             return recommendations
             
+        # Reuse the analysis of an identical profile
+        key = (
+            cpu_data.get('total_time', 0),
+            tuple((func.get('function', ''), func.get('ncalls', ''), func.get('tottime', 0))
+                  for func in cpu_data['functions'])
+        )
+        cached = self._cpu_cache.get(key)
+        if cached is not None:
+            recommendations, records = cached
+            self.records[CAT_CPU] = list(records)
+            self.recommendations[CAT_CPU] = list(recommendations)
+            return self.recommendations[CAT_CPU]
+            
+        started = time.perf_counter()
+        
         # Analyze hotspots
-        hotspots = cpu_data['functions'][:5]  # Top 5 functions
+        functions = cpu_data['functions']
+        hotspots = functions[:5]  # Top 5 functions
         
         if hotspots:
-            recommendations.append(
-                f"Focus optimization efforts on top time-consuming function: {hotspots[0].get('function', 'unknown')}"
-            )
-            
-        # Check for recursive functions
-        for func in cpu_data.get('functions', []):
-            if '/' in str(func.get('ncalls', '')):
-                recommendations.append(
-                    f"Function {func.get('function', 'unknown')} is recursive. "
-                    "Consider an iterative approach or memoization if it recalculates the same values."
-                )
-                
+            recommendations.append(self._record(
+                CAT_CPU,
+                self._TPL_TOP_FUNCTION(_TemplateFields(hotspots[0])),
+                tags=('hotspot',), priority=3
+            ))
+            
+        # Analyze each function; only the hotspots are classified by name
+        findings = []
+        for i, func in enumerate(functions):
+            findings.append(_analyze_function(func, i < len(hotspots)))
+            
+        # Report recursive functions
+        for func_findings in findings:
+            for text, tag, priority in func_findings:
+                if tag == 'recursion':
+                    recommendations.append(self._record(CAT_CPU, text, tags=(tag,), priority=priority))
+                    
         # Check overall execution time
         total_time = cpu_data.get('total_time', 0)
         if total_time > 1.0:
-            recommendations.append(
-                f"Total execution time ({total_time:.2f}s) is high. "
-                "Consider parallelizing or optimizing the most expensive operations."
-            )
-            
-        # Function-specific recommendations
-        for func in hotspots:
-            func_name = func.get('function', '')
+            recommendations.append(self._record(
+                CAT_CPU,
+                self._TPL_SLOW(cpu_data),
+                tags=('slow',), priority=2
+            ))
+            
+        # Function-specific recommendations for the hotspots
+        for func_findings in findings[:len(hotspots)]:
+            for text, tag, priority in func_findings:
+                if tag != 'recursion':
+                    recommendations.append(self._record(CAT_CPU, text, tags=(tag,), priority=priority))
+                    
+        # Only memoize analyses that are expensive enough to be worth keeping
+        if time.perf_counter() - started > _CPU_CACHE_MIN_SECONDS:
+            if len(self._cpu_cache) >= _CPU_CACHE_SIZE:
+                del self._cpu_cache[next(iter(self._cpu_cache))]
+            self._cpu_cache[key] = (list(recommendations), list(self.records[CAT_CPU]))
             
-            # Check for sorting operations
-            if any(sort_op in func_name.lower() for sort_op in ['sort', 'order']):
-                recommendations.append(
-                    f"Function {func_name} may involve sorting. "
-                    "Use appropriate sorting algorithm and consider the sorted() key parameter."
-                )
-                
-            # Check for I/O operations
-            if any(io_op in func_name.lower() for io_op in ['read', 'write', 'load', 'save', 'file', 'open']):
-                recommendations.append(
-                    f"Function {func_name} may involve I/O operations. "
-                    "Consider buffering, asynchronous I/O, or batching operations."
-                )
-                
-            # Check for string operations
-            if any(str_op in func_name.lower() for str_op in ['str', 'join', 'split', 'format']):
-                recommendations.append(
-                    f"Function {func_name} may involve string operations. "
-                    "Use ''.join() for concatenation and consider f-strings for formatting."
-                )
-                
-        self.recommendations['cpu'] = recommendations
+        self.recommendations[CAT_CPU] = recommendations
         return recommendations
         
     def generate_from_memory_profile(self, memory_data: Dict) -> List[str]:
@@ -113,35 +272,46 @@ class Recommendations:
             List of memory optimization recommendations
         """
         recommendations = []
+        self.records[CAT_MEM] = []
         
         # Check if we have memory data
         if not memory_data or not any(k in memory_data for k in ['memory_mb', 'peak_memory']):
-            recommendations.append(
-                "No memory profiling data available. Run a memory profile to get recommendations."
-            )
-            self.recommendations['memory'] = recommendations
+            recommendations.append(self._record(
+                CAT_MEM,
+                "No memory profiling data available. Run a memory profile to get recommendations.",
+                tags=('no_data',), priority=0
+            ))
+            self.recommendations[CAT_MEM] = recommendations
             return recommendations
             
+        # Convert the memory trace once so the checks below are array reductions
+        timestamps = np.asarray(memory_data.get('timestamps', []), dtype=np.float64)
+        mem_usage = np.asarray(memory_data.get('memory_mb', []), dtype=np.float64)
+        samples = min(timestamps.size, mem_usage.size)
+        timestamps = timestamps[:samples]
+        mem_usage = mem_usage[:samples]
+        
         # Check for memory leaks
         if memory_data.get('memory_increase', 0) > 5:  # More than 5MB increase
-            recommendations.append(
+            recommendations.append(self._record(
+                CAT_MEM,
                 f"Potential memory leak detected - memory increased by {memory_data.get('memory_increase', 0):.2f} MB. "
-                "Check for objects that aren't being garbage collected."
-            )
+                "Check for objects that aren't being garbage collected.",
+                tags=('leak',), priority=3
+            ))
             
         # Check peak memory usage
-        peak_memory = memory_data.get('peak_memory', 0)
+        peak_memory = memory_data.get('peak_memory', mem_usage.max() if samples else 0)
         if peak_memory > 500:  # More than 500MB
-            recommendations.append(
+            recommendations.append(self._record(
+                CAT_MEM,
                 f"High peak memory usage: {peak_memory:.2f} MB. "
-                "Consider batch processing or streaming approach for large datasets."
-            )
+                "Consider batch processing or streaming approach for large datasets.",
+                tags=('peak',), priority=3
+            ))
             
         # Check for memory growth rate
-        timestamps = memory_data.get('timestamps', [])
-        mem_usage = memory_data.get('memory_mb', [])
-        
-        if len(timestamps) > 1 and len(mem_usage) > 1:
+        if samples > 1:
             time_diff = timestamps[-1] - timestamps[0]
             mem_diff = mem_usage[-1] - mem_usage[0]
             
@@ -149,27 +319,46 @@ class Recommendations:
                 growth_rate = mem_diff / time_diff  # MB/s
                 
                 if growth_rate > 50:  # More than 50MB/s
-                    recommendations.append(
+                    recommendations.append(self._record(
+                        CAT_MEM,
                         f"High memory growth rate: {growth_rate:.2f} MB/s. "
-                        "Check for unnecessary object creation in loops."
-                    )
+                        "Check for unnecessary object creation in loops.",
+                        tags=('growth',), priority=2
+                    ))
+                    
+        # Check for memory that only ever grows across the trace
+        diffs = np.diff(mem_usage)
+        if (samples > 2 and np.ptp(timestamps) > 0 and np.all(diffs >= 0)
+                and mem_usage[-1] - mem_usage[0] >= _STEADY_GROWTH_MIN_MB):
+            slope = np.polyfit(timestamps, mem_usage, 1)[0]  # MB/s
+            if slope >= _STEADY_GROWTH_MIN_RATE:
+                recommendations.append(self._record(
+                    CAT_MEM,
+                    f"Memory grew steadily throughout the profile ({slope:.2f} MB/s). "
+                    "Check for caches or containers that are never cleared.",
+                    tags=('growth', 'leak'), priority=2
+                ))
                     
         # General memory recommendations
-        recommendations.append(
-            "For large data processing, consider generators, iterators, or lazy evaluation."
-        )
+        recommendations.append(self._record(
+            CAT_MEM,
+            "For large data processing, consider generators, iterators, or lazy evaluation.",
+            tags=('generators',), priority=1
+        ))
         
         # Check for final memory compared to baseline
-        baseline = memory_data.get('baseline_memory', 0)
-        final = memory_data.get('final_memory', 0)
+        baseline = memory_data.get('baseline_memory', mem_usage[0] if samples else 0)
+        final = memory_data.get('final_memory', mem_usage[-1] if samples else 0)
         
         if final > baseline * 2 and final - baseline > 10:  # More than doubled and >10MB increase
-            recommendations.append(
+            recommendations.append(self._record(
+                CAT_MEM,
                 f"Memory usage more than doubled from {baseline:.2f} MB to {final:.2f} MB. "
-                "Consider using context managers (with) to ensure resources are released."
-            )
+                "Consider using context managers (with) to ensure resources are released.",
+                tags=('growth', 'resources'), priority=2
+            ))
             
-        self.recommendations['memory'] = recommendations
+        self.recommendations[CAT_MEM] = recommendations
         return recommendations
         
     def generate_from_line_profile(self, line_data: Dict) -> List[str]:
@@ -183,13 +372,16 @@ class Recommendations:
             List of line-level optimization recommendations
         """
         recommendations = []
+        self.records[CAT_ALGO] = []
         
         # Check if we have line profile data
         if not line_data or 'functions' not in line_data or not line_data['functions']:
-            recommendations.append(
-                "No line profiling data available. Run a line profile to get recommendations."
-            )
-            self.recommendations['algorithm'] = recommendations
+            recommendations.append(self._record(
+                CAT_ALGO,
+                "No line profiling data available. Run a line profile to get recommendations.",
+                tags=('no_data',), priority=0
+            ))
+            self.recommendations[CAT_ALGO] = recommendations
             return recommendations
             
         # Analyze hotspots in each function
@@ -197,68 +389,73 @@ class Recommendations:
             func_name = func_data.get('function_name', 'unknown')
             lines = func_data.get('lines', {})
             
-            # Find the hotspot lines (highest time percentage)
-            hotspots = []
-            for line_num, line_info in lines.items():
-                if isinstance(line_num, str) and line_num == 'error':
-                    continue
-                
-                if isinstance(line_num, int) and line_info.get('percentage', 0) > 5:  # >5% of time
-                    hotspots.append({
-                        'line_num': line_num,
-                        'percentage': line_info.get('percentage', 0),
-                        'time': line_info.get('time', 0),
-                        'content': line_info.get('line_content', '')
-                    })
-                    
-            # Sort hotspots by percentage
-            hotspots.sort(key=lambda x: x['percentage'], reverse=True)
-            
-            # Generate recommendations for top hotspots
-            for i, hotspot in enumerate(hotspots[:3]):  # Top 3 hotspots
-                line_content = hotspot['content'].strip()
-                percentage = hotspot['percentage']
-                line_num = hotspot['line_num']
+            # Unpack the profiled lines (skipping error entries) into arrays
+            line_nums = [line_num for line_num in lines if isinstance(line_num, int)]
+            percentages = np.fromiter(
+                (lines[line_num].get('percentage', 0) for line_num in line_nums),
+                dtype=np.float64,
+                count=len(line_nums)
+            )
+            
+            # Generate recommendations for the top 3 hotspots above 5% of time
+            for idx in _select_hotspots(percentages, 5.0, 3):
+                line_num = line_nums[idx]
+                line_content = lines[line_num].get('line_content', '').strip()
+                percentage = percentages[idx]
                 
                 # Basic recommendation for the hotspot
-                recommendations.append(
-                    f"Hotspot at line {line_num} in {func_name} ({percentage:.1f}% of time): '{line_content}'"
-                )
+                recommendations.append(self._record(
+                    CAT_ALGO,
+                    f"Hotspot at line {line_num} in {func_name} ({percentage:.1f}% of time): '{line_content}'",
+                    tags=('hotspot',), priority=3
+                ))
                 
                 # Check for specific patterns in the line content
-                if re.search(r'for\s+.*\s+in\s+', line_content):
+                if _LOOP_RE.search(line_content):
                     # Loop hotspot
-                    recommendations.append(
-                        f"Consider optimizing the loop at line {line_num} - use list comprehension, vectorization, or Cython."
-                    )
-                elif re.search(r'if\s+.*\s+in\s+', line_content):
+                    recommendations.append(self._record(
+                        CAT_ALGO,
+                        f"Consider optimizing the loop at line {line_num} - use list comprehension, vectorization, or Cython.",
+                        tags=('loop',), priority=2
+                    ))
+                elif _MEMBERSHIP_RE.search(line_content):
                     # Membership test
-                    recommendations.append(
-                        f"Membership test at line {line_num} - use a set instead of a list for faster lookups."
-                    )
-                elif '+' in line_content and re.search(r'[\'"]\s*\+', line_content):
+                    recommendations.append(self._record(
+                        CAT_ALGO,
+                        f"Membership test at line {line_num} - use a set instead of a list for faster lookups.",
+                        tags=('membership',), priority=2
+                    ))
+                elif '+' in line_content and _STRING_CONCAT_RE.search(line_content):
                     # String concatenation
-                    recommendations.append(
-                        f"String concatenation at line {line_num} - use ''.join() or f-strings for better performance."
-                    )
-                elif re.search(r'\.\s*(?:append|extend|insert)', line_content):
+                    recommendations.append(self._record(
+                        CAT_ALGO,
+                        f"String concatenation at line {line_num} - use ''.join() or f-strings for better performance.",
+                        tags=('string',), priority=2
+                    ))
+                elif _LIST_MODIFY_RE.search(line_content):
                     # List modification
-                    recommendations.append(
-                        f"List modification at line {line_num} - consider preallocating the list if size is known."
-                    )
-                elif re.search(r'(?:sum|min|max|sorted|list|set|dict)\s*\(', line_content):
+                    recommendations.append(self._record(
+                        CAT_ALGO,
+                        f"List modification at line {line_num} - consider preallocating the list if size is known.",
+                        tags=('list',), priority=2
+                    ))
+                elif _BUILTIN_CALL_RE.search(line_content):
                     # Built-in function calls
-                    recommendations.append(
-                        f"Built-in function at line {line_num} - ensure you're using it efficiently."
-                    )
+                    recommendations.append(self._record(
+                        CAT_ALGO,
+                        f"Built-in function at line {line_num} - ensure you're using it efficiently.",
+                        tags=('builtin',), priority=1
+                    ))
                     
         # If no specific recommendations were generated
         if not recommendations:
-            recommendations.append(
-                "No clear line-level hotspots identified. Your code may benefit from algorithm-level optimizations."
-            )
+            recommendations.append(self._record(
+                CAT_ALGO,
+                "No clear line-level hotspots identified. Your code may benefit from algorithm-level optimizations.",
+                tags=('no_hotspot',), priority=0
+            ))
             
-        self.recommendations['algorithm'] = recommendations
+        self.recommendations[CAT_ALGO] = recommendations
         return recommendations
         
     def generate_from_code_analysis(self, analysis_results: Dict) -> List[str]:
@@ -272,13 +469,16 @@ class Recommendations:
             List of code structure optimization recommendations
         """
         recommendations = []
+        self.records[CAT_CODE] = []
         
         # Check if we have analysis results
         if not analysis_results or 'issues' not in analysis_results:
-            recommendations.append(
-                "No code analysis data available. Run a code analysis to get recommendations."
-            )
-            self.recommendations['code_structure'] = recommendations
+            recommendations.append(self._record(
+                CAT_CODE,
+                "No code analysis data available. Run a code analysis to get recommendations.",
+                tags=('no_data',), priority=0
+            ))
+            self.recommendations[CAT_CODE] = recommendations
             return recommendations
             
         # Get issues from analysis
@@ -286,53 +486,67 @@ class Recommendations:
         
         # Add issues as recommendations
         for issue in issues:
-            issue.get('severity', 'info')
+            severity = issue.get('severity', 'info')
             message = issue.get('message', '')
             line = issue.get('line', '')
             
             line_info = f" at line {line}" if line else ""
-            recommendations.append(f"{message}{line_info}")
+            recommendations.append(self._record(
+                CAT_CODE,
+                f"{message}{line_info}",
+                tags=('issue', severity), priority=_SEVERITY_PRIORITY.get(severity, 1)
+            ))
             
         # Check for optimization opportunities in loops
         loops = analysis_results.get('loops', [])
         nested_loops = [loop for loop in loops if loop.get('nested', False)]
         
         if nested_loops:
-            recommendations.append(
+            recommendations.append(self._record(
+                CAT_CODE,
                 f"Found {len(nested_loops)} nested loops. Nested loops can be performance bottlenecks. "
-                "Consider restructuring or using more efficient algorithms."
-            )
+                "Consider restructuring or using more efficient algorithms.",
+                tags=('nested_loop',), priority=2
+            ))
             
         # Check for optimization opportunities in data structures
         lists = analysis_results.get('data_structures', {}).get('lists', [])
         large_lists = [lst for lst in lists if lst.get('size', 0) > 100]
         
         if large_lists:
-            recommendations.append(
+            recommendations.append(self._record(
+                CAT_CODE,
                 f"Found {len(large_lists)} large lists. Consider if other data structures (sets, dictionaries) "
-                "would be more appropriate for your use case."
-            )
+                "would be more appropriate for your use case.",
+                tags=('data_structure',), priority=1
+            ))
             
         # Check for unused functions
         unused_funcs = analysis_results.get('unused_functions', [])
         if unused_funcs:
-            recommendations.append(
-                f"Found {len(unused_funcs)} unused functions. Remove dead code to improve maintainability."
-            )
+            recommendations.append(self._record(
+                CAT_CODE,
+                f"Found {len(unused_funcs)} unused functions. Remove dead code to improve maintainability.",
+                tags=('unused',), priority=1
+            ))
             
         # Import optimization recommendations
         imported_modules = analysis_results.get('imported_modules', [])
         if 'itertools' not in imported_modules and len(loops) > 3:
-            recommendations.append(
-                "Consider using itertools module for more efficient iteration patterns."
-            )
+            recommendations.append(self._record(
+                CAT_CODE,
+                "Consider using itertools module for more efficient iteration patterns.",
+                tags=('itertools',), priority=1
+            ))
             
         if 'collections' not in imported_modules and len(analysis_results.get('data_structures', {}).get('dicts', [])) > 3:
-            recommendations.append(
-                "Consider using collections.defaultdict or collections.Counter for cleaner dictionary operations."
-            )
+            recommendations.append(self._record(
+                CAT_CODE,
+                "Consider using collections.defaultdict or collections.Counter for cleaner dictionary operations.",
+                tags=('collections',), priority=1
+            ))
             
-        self.recommendations['code_structure'] = recommendations
+        self.recommendations[CAT_CODE] = recommendations
         return recommendations
         
     def generate_all(self, 
@@ -397,22 +611,27 @@ class Recommendations:
             
         return self.recommendations
         
-    def get_prioritized_recommendations(self, max_per_category: int = 5) -> List[str]:
+    def get_prioritized_recommendations(self, 
+                                       max_per_category: int = 5,
+                                       tags: Optional[Iterable[str]] = None) -> List[str]:
         """
         Get a prioritized list of recommendations across all categories.
         
         Args:
             max_per_category: Maximum number of recommendations per category
+            tags: Only include recommendations with at least one of these tags (optional)
             
         Returns:
             List of prioritized recommendations
         """
         prioritized = []
+        wanted = frozenset(tags) if tags is not None else None
         
-        # Get top recommendations from each category
-        for category, recs in self.recommendations.items():
-            top_recs = recs[:max_per_category]
-            for rec in top_recs:
-                prioritized.append(f"[{category.upper()}] {rec}")
+        # Get the highest priority recommendations from each category
+        for category, records in self.records.items():
+            if wanted is not None:
+                records = [rec for rec in records if not wanted.isdisjoint(rec.tags)]
+            for rec in heapq.nlargest(max_per_category, records, key=attrgetter('priority')):
+                prioritized.append(f"[{category.upper()}] {rec.text}")
                 
         return prioritized
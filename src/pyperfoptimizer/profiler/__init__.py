@@ -5,9 +5,9 @@ This module provides various profiling tools for analyzing the performance
 of Python code, including CPU, memory, and line-by-line profiling.
 """
 
-from pyperfoptimizer.profiler.cpu_profiler import CPUProfiler
+from pyperfoptimizer.profiler.cpu_profiler import CPUProfiler, FuncStat
 from pyperfoptimizer.profiler.line_profiler import LineProfiler
 from pyperfoptimizer.profiler.memory_profiler import MemoryProfiler
 from pyperfoptimizer.profiler.profile_manager import ProfileManager
 
-__all__ = ['CPUProfiler', 'MemoryProfiler', 'LineProfiler', 'ProfileManager']
+__all__ = ['CPUProfiler', 'FuncStat', 'MemoryProfiler', 'LineProfiler', 'ProfileManager']
@@ -6,7 +6,9 @@ an easy-to-use interface for CPU profiling Python code.
 """
 
 import cProfile
+import heapq
 import io
+import marshal
 import os
 import pstats
 import time
@@ -14,6 +16,51 @@ from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, TextIO
 
 
+class FuncStat(dict):
+    """
+    Statistics for a single profiled function.
+    
+    A plain dictionary with the keys 'function', 'ncalls', 'tottime',
+    'percall', 'cumtime' and 'percall_cumtime', so it encodes as JSON and can
+    be modified like any other record; the fields can also be read as
+    attributes (``stat.cumtime``).
+    """
+    __slots__ = ()
+    
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+            
+    def as_dict(self) -> Dict:
+        """Return the statistics as a plain dictionary."""
+        return dict(self)
+
+
+def _func_stat(key: tuple, entry: tuple) -> FuncStat:
+    """
+    Build the FuncStat record for one pstats entry.
+    
+    Args:
+        key: The pstats (filename, line, function name) key
+        entry: The pstats (cc, nc, tt, ct, callers) entry
+        
+    Returns:
+        The function's statistics
+    """
+    cc, nc, tt, ct, _ = entry
+    return FuncStat(
+        function=pstats.func_std_string(key),
+        # Recursive functions report total/primitive calls, as pstats prints them
+        ncalls=str(nc) if nc == cc else f'{nc}/{cc}',
+        tottime=tt,
+        percall=tt / nc if nc else 0.0,
+        cumtime=ct,
+        percall_cumtime=ct / cc if cc else 0.0
+    )
+
+
 class CPUProfiler:
     """
     A class for CPU profiling Python code.
@@ -39,12 +86,42 @@ class CPUProfiler:
         self.strip_dirs = strip_dirs
         self.include_builtins = include_builtins
         self.profiler = cProfile.Profile()
-        self.results = None
+        # Raw cProfile data loaded from a file, wrapped in pstats on first use
+        self._raw_stats = None
+        self._results = None
         self.start_time = None
         self.end_time = None
+        # Parsed statistics, keyed by the id of the pstats object they came from
+        self._stats_cache = None
+        
+    @property
+    def results(self) -> Optional[pstats.Stats]:
+        """The profiling results as a pstats.Stats object, or None."""
+        if self._results is None and self._raw_stats is not None:
+            stats = pstats.Stats()
+            stats.stats = self._raw_stats
+            stats.get_top_level_stats()
+            # Strip before sorting; strip_dirs discards the sort order
+            if self.strip_dirs:
+                stats.strip_dirs()
+            stats.sort_stats(self.sort_by)
+            self._results = stats
+            self._raw_stats = None
+        return self._results
+        
+    @results.setter
+    def results(self, value: Optional[pstats.Stats]) -> None:
+        self._invalidate_stats_cache()
+        self._results = value
+        self._raw_stats = None
+        
+    def _invalidate_stats_cache(self) -> None:
+        """Discard any cached statistics."""
+        self._stats_cache = None
         
     def start(self) -> None:
         """Start CPU profiling."""
+        self._invalidate_stats_cache()
         self.start_time = time.time()
         self.profiler.enable()
         
@@ -83,53 +160,46 @@ class CPUProfiler:
         Get profiling statistics.
         
         Returns:
-            A dictionary containing profiling statistics
+            A dictionary containing profiling statistics; each call returns a
+            new dictionary, so callers may modify it
         """
         if not self.results:
             return {}
             
+        # Reuse the parsed statistics until the results change; every path
+        # that replaces the results invalidates the cache
+        if self._stats_cache is not None:
+            return self._copy_stats(self._stats_cache)
+            
         stats = {}
         # Total execution time
         stats['total_time'] = self.end_time - self.start_time if self.start_time and self.end_time else 0
         
-        # Get function statistics
+        # Keep the formatted pstats report
         s = io.StringIO()
         self.results.stream = s
         self.results.print_stats()
         
-        # Parse the stats output into structured data
-        stats_str = s.getvalue()
-        stats['raw_output'] = stats_str
-        
-        # Extract function-level data
-        functions = []
-        in_data = False
-        for line in stats_str.split('\n'):
-            stripped = line.strip()
-            if stripped.startswith('ncalls'):
-                in_data = True
-                continue
-            if in_data and stripped:
-                parts = stripped.split()
-                if len(parts) >= 6:
-                    try:
-                        func_data = {
-                            'ncalls': parts[0],
-                            'tottime': float(parts[1]),
-                            'percall': float(parts[2]),
-                            'cumtime': float(parts[3]),
-                            'percall_cumtime': float(parts[4]),
-                            'function': ' '.join(parts[5:])
-                        }
-                        functions.append(func_data)
-                    except (ValueError, IndexError):
-                        continue
-        
-        stats['functions'] = functions
+        stats['raw_output'] = s.getvalue()
+        
+        # Function-level records, built straight from the pstats data in
+        # the sorted order
+        raw_stats = self.results.stats
+        keys = self.results.fcn_list or list(raw_stats)
+        stats['functions'] = [_func_stat(key, raw_stats[key]) for key in keys]
+        
+        self._stats_cache = stats
+        
+        return self._copy_stats(stats)
+        
+    @staticmethod
+    def _copy_stats(stats: Dict) -> Dict:
+        """Copy cached statistics so callers can modify the result."""
+        stats = dict(stats)
+        stats['functions'] = [FuncStat(func) for func in stats['functions']]
         
         # Add date and time information
         stats['timestamp'] = datetime.now().isoformat()
-        
         return stats
             
     def print_stats(self, 
@@ -159,14 +229,17 @@ class CPUProfiler:
         Args:
             filename: File to save the statistics to
         """
-        if not self.results:
+        # Save loaded data as-is rather than wrapping it in pstats first
+        raw_stats = self._raw_stats if self._results is None else self._results.stats
+        if not raw_stats:
             return
             
         # Ensure the directory exists
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
         
-        # Save stats to file
-        self.results.dump_stats(filename)
+        # Save stats to file in the marshal format read by pstats
+        with open(filename, 'wb') as f:
+            marshal.dump(raw_stats, f)
         
     def load_stats(self, filename: str) -> None:
         """
@@ -175,11 +248,13 @@ class CPUProfiler:
         Args:
             filename: File to load the statistics from
         """
-        stats = pstats.Stats(filename)
-        stats.sort_stats(self.sort_by)
-        if self.strip_dirs:
-            stats.strip_dirs()
-        self.results = stats
+        with open(filename, 'rb') as f:
+            raw_stats = marshal.load(f)
+            
+        # The pstats wrapper is only built when the results are used
+        self._invalidate_stats_cache()
+        self._results = None
+        self._raw_stats = raw_stats
         
     def get_top_functions(self, n: int = 10) -> List[Dict]:
         """
@@ -191,15 +266,15 @@ class CPUProfiler:
         Returns:
             List of dictionaries containing function information
         """
-        stats = self.get_stats()
-        if not stats or 'functions' not in stats:
+        if not self.results:
             return []
             
-        # Sort by cumulative time and return top n
-        sorted_funcs = sorted(stats['functions'], 
-                              key=lambda x: x['cumtime'], 
-                              reverse=True)
-        return sorted_funcs[:n]
+        # Select the top n by cumulative time straight from the pstats
+        # entries, only building records for the selected functions
+        raw_stats = self.results.stats
+        keys = self.results.fcn_list or list(raw_stats)
+        top = heapq.nlargest(n, keys, key=lambda key: raw_stats[key][3])
+        return [_func_stat(key, raw_stats[key]) for key in top]
         
     def clear(self) -> None:
         """Clear profiling results and reset profiler."""
@@ -207,3 +282,4 @@ class CPUProfiler:
         self.results = None
         self.start_time = None
         self.end_time = None
+        self._invalidate_stats_cache()
@@ -5,10 +5,13 @@ This module integrates with the line_profiler package to provide detailed
 line-by-line execution timing for Python code.
 """
 
+import heapq
 import io
+import marshal
 import os
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, TextIO
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
 
 # Check if line_profiler is installed
 try:
@@ -17,6 +20,42 @@ try:
 except ImportError:
     _HAS_LINE_PROFILER = False
 
+
+def _line_details(filename: str, entries: Iterable, function_time: float, unit: float) -> Dict:
+    """
+    Build the per-line statistics of a profiled function.
+    
+    Args:
+        filename: Source file of the function
+        entries: (line number, hits, time) tuples, with times in profiler units
+        function_time: Total time of the function in profiler units
+        unit: Length of one profiler unit in seconds
+        
+    Returns:
+        Dictionary mapping line numbers to their statistics, or holding an
+        'error' key if the source could not be read
+    """
+    lines = {}
+    try:
+        if os.path.exists(filename):
+            with open(filename, 'r') as f:
+                all_lines = f.readlines()
+                
+            for line_idx, hits_count, time in entries:
+                line_content = all_lines[line_idx - 1].rstrip() if 0 < line_idx <= len(all_lines) else ""
+                lines[line_idx] = {
+                    'hits': hits_count,
+                    'time': time * unit,
+                    'time_per_hit': time * unit / hits_count if hits_count > 0 else 0,
+                    'percentage': (time / function_time * 100) if function_time > 0 else 0,
+                    'line_content': line_content
+                }
+    except Exception as e:
+        lines['error'] = str(e)
+        
+    return lines
+
+
 class LineProfiler:
     """
     A class for line-by-line profiling of Python code.
@@ -102,28 +141,35 @@ class LineProfiler:
                     # Extract line number (first line of the function)
                     line_number = min(lines_data.keys()) if lines_data else 0
                     
-                    # Calculate total time for this function
-                    total_time = sum(time for _, time in lines_data.values()) / 1e6  # Convert to seconds
+                    # Calculate total time for this function (in microseconds)
+                    function_time = sum(time for _, time in lines_data.values())
+                    total_time = function_time / 1e6  # Convert to seconds
+                    
+                    # Get the source code for each line
+                    entries = [(line_idx, hits_count, time)
+                               for line_idx, (hits_count, time) in lines_data.items()]
+                    lines = _line_details(filename, entries, function_time, 1e-6)
+                        
+                    function_stats = {
+                        'filename': filename,
+                        'line_number': line_number,
+                        'function_name': function_name,
+                        'total_time': total_time,
+                        'lines': lines
+                    }
+                    
+                    stats['functions'].append(function_stats)
+            
+            # Handle LineStats results, which map functions to (line, hits, time) entries
+            elif hasattr(self.results, 'timings'):
+                unit = self.results.unit
+                for (filename, line_number, function_name), entries in self.results.timings.items():
+                    # Get the total time spent in this function
+                    function_time = sum(time for _, _, time in entries)
+                    total_time = function_time * unit
                     
                     # Get the source code for each line
-                    lines = {}
-                    try:
-                        if os.path.exists(filename):
-                            with open(filename, 'r') as f:
-                                all_lines = f.readlines()
-                                
-                            for line_idx, (hits_count, time) in lines_data.items():
-                                line_content = all_lines[line_idx - 1].rstrip() if 0 < line_idx <= len(all_lines) else ""
-                                lines[line_idx] = {
-                                    'hits': hits_count,
-                                    'time': time / 1e6,  # Convert to seconds
-                                    'time_per_hit': time / hits_count / 1e6 if hits_count > 0 else 0,
-                                    'percentage': (time / sum(time for _, time in lines_data.values()) * 100) 
-                                                  if sum(time for _, time in lines_data.values()) > 0 else 0,
-                                    'line_content': line_content
-                                }
-                    except Exception as e:
-                        lines['error'] = str(e)
+                    lines = _line_details(filename, entries, function_time, unit)
                         
                     function_stats = {
                         'filename': filename,
@@ -138,30 +184,17 @@ class LineProfiler:
             # Handle the case where results is a dictionary with items() method
             elif hasattr(self.results, 'items'):
                 for (filename, line_number, function_name), timings in self.results.items():
-                    # Get the total time spent in this function
-                    total_time = sum(timings) / 1e6  # Convert to seconds
+                    # Get the total time spent in this function (in microseconds)
+                    function_time = sum(timings)
+                    total_time = function_time / 1e6  # Convert to seconds
                     
                     # Get the number of hits for each line
                     hits = self.line_profiler.code_map.get((filename, function_name), {})
                     
                     # Get the source code for each line
-                    lines = {}
-                    try:
-                        if os.path.exists(filename):
-                            with open(filename, 'r') as f:
-                                all_lines = f.readlines()
-                                
-                            for line_idx, (hits_count, time) in hits.items():
-                                line_content = all_lines[line_idx - 1].rstrip() if 0 < line_idx <= len(all_lines) else ""
-                                lines[line_idx] = {
-                                    'hits': hits_count,
-                                    'time': time / 1e6,  # Convert to seconds
-                                    'time_per_hit': time / hits_count / 1e6 if hits_count > 0 else 0,
-                                    'percentage': (time / sum(timings) * 100) if sum(timings) > 0 else 0,
-                                    'line_content': line_content
-                                }
-                    except Exception as e:
-                        lines['error'] = str(e)
+                    entries = [(line_idx, hits_count, time)
+                               for line_idx, (hits_count, time) in hits.items()]
+                    lines = _line_details(filename, entries, function_time, 1e-6)
                         
                     function_stats = {
                         'filename': filename,
@@ -223,41 +256,54 @@ class LineProfiler:
         """
         Save line profiling statistics to a file.
         
+        The raw timings are written with marshal. Files pickled by earlier
+        versions of PyPerfOptimizer can no longer be loaded and need to be
+        profiled again.
+        
         Args:
             filename: File to save the statistics to
+            
+        Raises:
+            ValueError: If the results hold no raw timings to save
         """
         if not self.results:
             return
             
+        if not hasattr(self.results, 'timings'):
+            raise ValueError("Unsupported line_profiler results format; cannot save stats")
+            
         # Ensure the directory exists
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
         
-        # Try to pickle the stats
-        try:
-            import pickle
-            with open(filename, 'wb') as f:
-                pickle.dump(self.get_stats(), f)
-        except Exception:
-            # Fall back to a text file if pickling fails
-            with open(filename, 'w') as f:
-                self.print_stats(output=f)
+        # Save the raw timings, which are plain tuples and lists, with marshal
+        with open(filename, 'wb') as f:
+            marshal.dump({'timings': dict(self.results.timings), 'unit': self.results.unit}, f)
                 
     def load_stats(self, filename: str) -> None:
         """
         Load line profiling statistics from a file.
         
+        Only files written by save_stats are supported; stats pickled by
+        earlier versions of PyPerfOptimizer are rejected.
+        
         Args:
             filename: File to load the statistics from
+            
+        Raises:
+            ValueError: If the file is not a saved line profiling stats file
         """
         try:
-            import pickle
             with open(filename, 'rb') as f:
-                stats = pickle.load(f)
+                data = marshal.load(f)
                 
-            # Recreate the LineProfiler with loaded stats
-            self.results = stats
+            # Recreate the LineStats the profiler produced
+            self.results = line_profiler.LineStats(data['timings'], data['unit'])
         except Exception as e:
-            raise ValueError(f"Failed to load line profiling stats: {str(e)}")
+            raise ValueError(
+                f"Failed to load line profiling stats from {filename}: {str(e)}. "
+                "Stats are saved with marshal; files pickled by earlier versions "
+                "must be re-generated"
+            )
             
     def clear(self) -> None:
         """Clear profiling results and reset the profiler."""
@@ -297,7 +343,5 @@ class LineProfiler:
                         'percentage': line_info.get('percentage', 0)
                     })
         
-        # Sort by time in descending order
-        hotspots.sort(key=lambda x: x['time'], reverse=True)
-        
-        return hotspots[:n]
+        # Select the n slowest lines without sorting them all
+        return heapq.nlargest(n, hotspots, key=itemgetter('time'))
@@ -6,12 +6,13 @@ of Python functions and code blocks.
 """
 
 import importlib.util
+import json
 import os
 import tempfile
 import time
 import traceback
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional, TextIO
+from typing import Any, BinaryIO, Callable, Dict, Optional, TextIO, Union
 
 import psutil
 
@@ -22,6 +23,26 @@ try:
 except ImportError:
     _HAS_MEMORY_PROFILER = False
 
+# Serialize statistics with orjson when available; it encodes straight to
+# bytes and is several times faster than the stdlib encoder
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+def _dumps(obj: Any) -> bytes:
+    """Encode statistics as indented JSON bytes."""
+    if _HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode()
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes written by _dumps."""
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # Function to get memory usage in MB using psutil as a fallback
 def get_memory_usage():
     """Get current memory usage in MB."""
@@ -308,34 +329,43 @@ class MemoryProfiler:
         print(f"Memory Increase: {stats['memory_increase']:.2f} MB", file=output)
         print(f"Average Memory: {stats['avg_memory']:.2f} MB", file=output)
         
-    def save_stats(self, filename: str) -> None:
+    def save_stats(self, filename: Union[str, BinaryIO]) -> None:
         """
         Save memory profiling statistics to a file.
         
         Args:
-            filename: File to save the statistics to
+            filename: File, or binary file object, to save the statistics to
         """
         if not self.results:
             return
             
+        data = _dumps(self.get_stats())
+        
+        # Write directly to file objects
+        if hasattr(filename, 'write'):
+            filename.write(data)
+            return
+            
         # Ensure the directory exists
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
         
         # Save stats to file
-        import json
-        with open(filename, 'w') as f:
-            json.dump(self.get_stats(), f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(data)
             
-    def load_stats(self, filename: str) -> None:
+    def load_stats(self, filename: Union[str, BinaryIO]) -> None:
         """
         Load memory profiling statistics from a file.
         
         Args:
-            filename: File to load the statistics from
+            filename: File, or binary file object, to load the statistics from
         """
-        import json
-        with open(filename, 'r') as f:
-            self.results = json.load(f)
+        if hasattr(filename, 'read'):
+            self.results = _loads(filename.read())
+            return
+            
+        with open(filename, 'rb') as f:
+            self.results = _loads(f.read())
             
     def clear(self) -> None:
         """Clear profiling results."""
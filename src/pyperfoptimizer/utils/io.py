@@ -169,7 +169,7 @@ def _export_html(results: Dict, filename: str) -> None:
         filename: Path to save the HTML file to
     """
     # Create a simple HTML representation of the results
-    html = """
+    parts = ["""
     <!DOCTYPE html>
     <html>
     <head>
@@ -187,22 +187,22 @@ def _export_html(results: Dict, filename: str) -> None:
     </head>
     <body>
         <h1>PyPerfOptimizer Profiling Results</h1>
-    """
+    """]
     
     # Add timestamp
     if 'timestamp' in results:
-        html += f"<p>Generated: {results['timestamp']}</p>"
+        parts.append(f"<p>Generated: {results['timestamp']}</p>")
     else:
-        html += f"<p>Generated: {datetime.now().isoformat()}</p>"
+        parts.append(f"<p>Generated: {datetime.now().isoformat()}</p>")
         
     # Add profiler results
     profilers = results.get('profilers', {})
     
     for profiler_name, profiler_data in profilers.items():
-        html += f"<div class='section'><h2>{profiler_name.upper()} Profiling Results</h2>"
+        parts.append(f"<div class='section'><h2>{profiler_name.upper()} Profiling Results</h2>")
         
         if profiler_name == 'cpu' and 'functions' in profiler_data:
-            html += """
+            parts.append("""
             <table>
                 <tr>
                     <th>Function</th>
@@ -211,10 +211,10 @@ def _export_html(results: Dict, filename: str) -> None:
                     <th>Time/Call (s)</th>
                     <th>Cumulative Time (s)</th>
                 </tr>
-            """
+            """)
             
             for func in profiler_data['functions'][:20]:  # Top 20 functions
-                html += f"""
+                parts.append(f"""
                 <tr>
                     <td>{func.get('function', '')}</td>
                     <td>{func.get('ncalls', '')}</td>
@@ -222,26 +222,26 @@ def _export_html(results: Dict, filename: str) -> None:
                     <td>{func.get('percall', 0)}</td>
                     <td>{func.get('cumtime', 0)}</td>
                 </tr>
-                """
+                """)
                 
-            html += "</table>"
+            parts.append("</table>")
             
         elif profiler_name == 'memory':
-            html += "<p>"
+            parts.append("<p>")
             if 'peak_memory' in profiler_data:
-                html += f"Peak Memory: {profiler_data['peak_memory']:.2f} MB<br>"
+                parts.append(f"Peak Memory: {profiler_data['peak_memory']:.2f} MB<br>")
             if 'baseline_memory' in profiler_data:
-                html += f"Baseline Memory: {profiler_data['baseline_memory']:.2f} MB<br>"
+                parts.append(f"Baseline Memory: {profiler_data['baseline_memory']:.2f} MB<br>")
             if 'memory_increase' in profiler_data:
-                html += f"Memory Increase: {profiler_data['memory_increase']:.2f} MB<br>"
-            html += "</p>"
+                parts.append(f"Memory Increase: {profiler_data['memory_increase']:.2f} MB<br>")
+            parts.append("</p>")
             
         elif profiler_name == 'line' and 'functions' in profiler_data:
             for func in profiler_data['functions']:
-                html += f"<h3>Function: {func.get('function_name', '')}</h3>"
-                html += f"<p>Total Time: {func.get('total_time', 0):.4f}s</p>"
+                parts.append(f"<h3>Function: {func.get('function_name', '')}</h3>")
+                parts.append(f"<p>Total Time: {func.get('total_time', 0):.4f}s</p>")
                 
-                html += """
+                parts.append("""
                 <table>
                     <tr>
                         <th>Line</th>
@@ -251,14 +251,14 @@ def _export_html(results: Dict, filename: str) -> None:
                         <th>% Time</th>
                         <th>Code</th>
                     </tr>
-                """
+                """)
                 
                 for line_num, line_info in func.get('lines', {}).items():
                     if isinstance(line_num, str) and line_num == 'error':
                         continue
                         
                     if isinstance(line_num, int):
-                        html += f"""
+                        parts.append(f"""
                         <tr>
                             <td>{line_num}</td>
                             <td>{line_info.get('hits', 0)}</td>
@@ -267,34 +267,34 @@ def _export_html(results: Dict, filename: str) -> None:
                             <td>{line_info.get('percentage', 0):.1f}%</td>
                             <td>{line_info.get('line_content', '')}</td>
                         </tr>
-                        """
+                        """)
                         
-                html += "</table>"
+                parts.append("</table>")
                 
-        html += "</div>"
+        parts.append("</div>")
         
     # Add recommendations if available
     if 'recommendations' in results:
-        html += "<div class='section'><h2>Recommendations</h2>"
+        parts.append("<div class='section'><h2>Recommendations</h2>")
         
         for category, items in results['recommendations'].items():
             if items:
-                html += f"<h3>{category.upper()}</h3><ul>"
+                parts.append(f"<h3>{category.upper()}</h3><ul>")
                 for item in items:
-                    html += f"<li>{item}</li>"
-                html += "</ul>"
+                    parts.append(f"<li>{item}</li>")
+                parts.append("</ul>")
                 
-        html += "</div>"
+        parts.append("</div>")
         
     # Close the HTML
-    html += """
+    parts.append("""
     </body>
     </html>
-    """
+    """)
     
     # Write the HTML to the file
     with open(filename, 'w') as f:
-        f.write(html)
+        f.write(''.join(parts))
 
 def _export_csv(results: Dict, filename: str) -> None:
     """
@@ -305,7 +305,7 @@ def _export_csv(results: Dict, filename: str) -> None:
         filename: Path to save the CSV file to
     """
     # Focus on function-level data which is most suitable for CSV
-    csv_data = "Category,Function,Calls,TotalTime,TimePerCall,CumulativeTime\n"
+    rows = ["Category,Function,Calls,TotalTime,TimePerCall,CumulativeTime\n"]
     
     profilers = results.get('profilers', {})
     
@@ -320,13 +320,13 @@ def _export_csv(results: Dict, filename: str) -> None:
                 f"{func.get('percall', 0)},"
                 f"{func.get('cumtime', 0)}\n"
             )
-            csv_data += line
+            rows.append(line)
             
     # Export line profiling data
     if 'line' in profilers and 'functions' in profilers['line']:
         for func in profilers['line']['functions']:
             func_name = func.get('function_name', '')
-            filename = func.get('filename', '')
+            source_file = func.get('filename', '')
             
             for line_num, line_info in func.get('lines', {}).items():
                 if isinstance(line_num, str) and line_num == 'error':
@@ -335,17 +335,17 @@ def _export_csv(results: Dict, filename: str) -> None:
                 if isinstance(line_num, int):
                     line = (
                         f"LINE,"
-                        f"\"{func_name}:{filename}:{line_num}\","
+                        f"\"{func_name}:{source_file}:{line_num}\","
                         f"{line_info.get('hits', 0)},"
                         f"{line_info.get('time', 0)},"
                         f"{line_info.get('time_per_hit', 0)},"
                         f"{line_info.get('percentage', 0)}%\n"
                     )
-                    csv_data += line
+                    rows.append(line)
                     
     # Write the CSV data to the file
     with open(filename, 'w') as f:
-        f.write(csv_data)
+        f.write(''.join(rows))
 
 def _import_csv(filename: str) -> Dict:
     """
@@ -0,0 +1,23 @@
+"""
+Shared helpers for the PyPerfOptimizer visualizers.
+"""
+
+from typing import Any, BinaryIO, Union
+
+
+class MatplotlibSaveMixin:
+    """
+    Saving of matplotlib figures, shared by the visualizers.
+
+    Set ``_fast_save`` on an instance to save figures as low-resolution raw
+    RGBA, skipping PNG compression, when only the presence of output matters.
+    """
+
+    _fast_save = False
+
+    def _save_mpl(self, fig: Any, save_path: Union[str, BinaryIO]) -> None:
+        """Save a matplotlib figure to a path or binary file object."""
+        if self._fast_save:
+            fig.savefig(save_path, format='raw', dpi=60)
+        else:
+            fig.savefig(save_path, bbox_inches='tight')
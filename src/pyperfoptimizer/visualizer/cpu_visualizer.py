@@ -5,8 +5,11 @@ This module provides tools for visualizing CPU profiling results
 using various chart types and formats.
 """
 
+import heapq
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, TextIO, Tuple, Union
+
+from pyperfoptimizer.visualizer.common import MatplotlibSaveMixin
 
 # Try to import visualization libraries
 try:
@@ -23,7 +26,7 @@ try:
 except ImportError:
     _HAS_PLOTLY = False
 
-class CPUVisualizer:
+class CPUVisualizer(MatplotlibSaveMixin):
     """
     A class for visualizing CPU profiling results.
     
@@ -84,7 +87,8 @@ class CPUVisualizer:
                            top_n: int = 10,
                            sort_by: str = 'cumtime',
                            show: bool = True,
-                           save_path: Optional[str] = None) -> Any:
+                           save_path: Optional[Union[str, BinaryIO]] = None,
+                           ax: Optional[Any] = None) -> Any:
         """
         Plot time spent in different functions.
         
@@ -93,7 +97,9 @@ class CPUVisualizer:
             top_n: Number of top functions to display
             sort_by: Sorting criteria ('cumtime' or 'tottime')
             show: Whether to display the plot
-            save_path: Path to save the plot to (optional)
+            save_path: Path, or binary file object, to save the plot to (optional)
+            ax: Matplotlib axes to draw into instead of a new figure
+                (matplotlib backend only, optional)
             
         Returns:
             The figure object
@@ -112,15 +118,13 @@ class CPUVisualizer:
         else:
             raise ValueError(f"Invalid sort_by value: {sort_by}")
             
-        sorted_funcs = sorted(
+        # Take the top N functions without sorting the rest
+        top_funcs = heapq.nlargest(
+            top_n,
             functions, 
-            key=lambda x: float(x.get(sort_key, 0)), 
-            reverse=True
+            key=lambda x: float(x.get(sort_key, 0))
         )
         
-        # Take the top N functions
-        top_funcs = sorted_funcs[:top_n]
-        
         # Extract function names and times
         func_names = [func.get('function', '').split('/')[-1] for func in top_funcs]
         func_times = [float(func.get(sort_key, 0)) for func in top_funcs]
@@ -131,7 +135,7 @@ class CPUVisualizer:
         
         # Create the figure based on the backend
         if self.backend == 'matplotlib':
-            return self._plot_function_times_mpl(func_names, func_times, sort_by, show, save_path)
+            return self._plot_function_times_mpl(func_names, func_times, sort_by, show, save_path, ax)
         else:  # plotly
             return self._plot_function_times_plotly(func_names, func_times, sort_by, show, save_path)
             
@@ -140,9 +144,13 @@ class CPUVisualizer:
                                 func_times: List[float],
                                 sort_by: str,
                                 show: bool,
-                                save_path: Optional[str]) -> Any:
+                                save_path: Optional[Union[str, BinaryIO]],
+                                ax: Optional[Any] = None) -> Any:
         """Create a function times plot using matplotlib."""
-        fig, ax = plt.subplots(figsize=self.fig_size)
+        if ax is None:
+            fig, ax = plt.subplots(figsize=self.fig_size)
+        else:
+            fig = ax.figure
         
         # Create a horizontal bar chart
         y_pos = range(len(func_names))
@@ -160,11 +168,11 @@ class CPUVisualizer:
             ax.text(v + 0.01 * max(func_times), i, f'{v:.4f}s', va='center')
             
         # Adjust layout
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save the figure if requested
         if save_path:
-            plt.savefig(save_path, bbox_inches='tight')
+            self._save_mpl(fig, save_path)
             
         # Show the figure if requested
         if show:
@@ -177,7 +185,7 @@ class CPUVisualizer:
                                    func_times: List[float],
                                    sort_by: str,
                                    show: bool,
-                                   save_path: Optional[str]) -> Any:
+                                   save_path: Optional[Union[str, BinaryIO]]) -> Any:
         """Create a function times plot using plotly."""
         # Set the template based on the theme
         template = 'plotly_dark' if self.theme == 'dark' else 'plotly_white'
@@ -219,7 +227,8 @@ class CPUVisualizer:
                         profile_data: Dict,
                         top_n: int = 10,
                         show: bool = True,
-                        save_path: Optional[str] = None) -> Any:
+                        save_path: Optional[Union[str, BinaryIO]] = None,
+                        ax: Optional[Any] = None) -> Any:
         """
         Plot function call counts.
         
@@ -227,7 +236,9 @@ class CPUVisualizer:
             profile_data: CPU profiling data (from CPUProfiler.get_stats())
             top_n: Number of top functions to display
             show: Whether to display the plot
-            save_path: Path to save the plot to (optional)
+            save_path: Path, or binary file object, to save the plot to (optional)
+            ax: Matplotlib axes to draw into instead of a new figure
+                (matplotlib backend only, optional)
             
         Returns:
             The figure object
@@ -238,7 +249,7 @@ class CPUVisualizer:
         # Extract function data
         functions = profile_data.get('functions', [])
         
-        # Extract call counts and sort
+        # Extract call counts
         func_data = []
         for func in functions:
             if 'ncalls' in func:
@@ -253,9 +264,8 @@ class CPUVisualizer:
                 except (ValueError, IndexError):
                     continue
                     
-        # Sort by call count and take top N
-        sorted_funcs = sorted(func_data, key=lambda x: x['calls'], reverse=True)
-        top_funcs = sorted_funcs[:top_n]
+        # Take the top N by call count; functions sharing a name stay separate
+        top_funcs = heapq.nlargest(top_n, func_data, key=lambda x: x['calls'])
         
         # Extract names and call counts
         func_names = [func['name'] for func in top_funcs]
@@ -267,7 +277,7 @@ class CPUVisualizer:
         
         # Create the figure based on the backend
         if self.backend == 'matplotlib':
-            return self._plot_call_counts_mpl(func_names, call_counts, show, save_path)
+            return self._plot_call_counts_mpl(func_names, call_counts, show, save_path, ax)
         else:  # plotly
             return self._plot_call_counts_plotly(func_names, call_counts, show, save_path)
             
@@ -275,9 +285,13 @@ class CPUVisualizer:
                              func_names: List[str],
                              call_counts: List[int],
                              show: bool,
-                             save_path: Optional[str]) -> Any:
+                             save_path: Optional[Union[str, BinaryIO]],
+                             ax: Optional[Any] = None) -> Any:
         """Create a call counts plot using matplotlib."""
-        fig, ax = plt.subplots(figsize=self.fig_size)
+        if ax is None:
+            fig, ax = plt.subplots(figsize=self.fig_size)
+        else:
+            fig = ax.figure
         
         # Create a horizontal bar chart
         y_pos = range(len(func_names))
@@ -294,11 +308,11 @@ class CPUVisualizer:
             ax.text(v + 0.01 * max(call_counts), i, str(v), va='center')
             
         # Adjust layout
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save the figure if requested
         if save_path:
-            plt.savefig(save_path, bbox_inches='tight')
+            self._save_mpl(fig, save_path)
             
         # Show the figure if requested
         if show:
@@ -310,7 +324,7 @@ class CPUVisualizer:
                                 func_names: List[str],
                                 call_counts: List[int],
                                 show: bool,
-                                save_path: Optional[str]) -> Any:
+                                save_path: Optional[Union[str, BinaryIO]]) -> Any:
         """Create a call counts plot using plotly."""
         # Set the template based on the theme
         template = 'plotly_dark' if self.theme == 'dark' else 'plotly_white'
@@ -351,7 +365,8 @@ class CPUVisualizer:
                           profile_data: Dict,
                           top_n: int = 10,
                           show: bool = True,
-                          save_path: Optional[str] = None) -> Any:
+                          save_path: Optional[Union[str, BinaryIO]] = None,
+                          ax: Optional[Any] = None) -> Any:
         """
         Plot time per call for functions.
         
@@ -359,7 +374,9 @@ class CPUVisualizer:
             profile_data: CPU profiling data (from CPUProfiler.get_stats())
             top_n: Number of top functions to display
             show: Whether to display the plot
-            save_path: Path to save the plot to (optional)
+            save_path: Path, or binary file object, to save the plot to (optional)
+            ax: Matplotlib axes to draw into instead of a new figure
+                (matplotlib backend only, optional)
             
         Returns:
             The figure object
@@ -370,7 +387,7 @@ class CPUVisualizer:
         # Extract function data
         functions = profile_data.get('functions', [])
         
-        # Calculate time per call and sort
+        # Calculate time per call
         func_data = []
         for func in functions:
             if 'percall_cumtime' in func and 'function' in func:
@@ -383,9 +400,8 @@ class CPUVisualizer:
                 except ValueError:
                     continue
                     
-        # Sort by time per call and take top N
-        sorted_funcs = sorted(func_data, key=lambda x: x['time_per_call'], reverse=True)
-        top_funcs = sorted_funcs[:top_n]
+        # Take the top N by time per call
+        top_funcs = heapq.nlargest(top_n, func_data, key=lambda x: x['time_per_call'])
         
         # Extract names and times per call
         func_names = [func['name'] for func in top_funcs]
@@ -397,7 +413,7 @@ class CPUVisualizer:
         
         # Create the figure based on the backend
         if self.backend == 'matplotlib':
-            return self._plot_time_per_call_mpl(func_names, times_per_call, show, save_path)
+            return self._plot_time_per_call_mpl(func_names, times_per_call, show, save_path, ax)
         else:  # plotly
             return self._plot_time_per_call_plotly(func_names, times_per_call, show, save_path)
             
@@ -405,9 +421,13 @@ class CPUVisualizer:
                                func_names: List[str],
                                times_per_call: List[float],
                                show: bool,
-                               save_path: Optional[str]) -> Any:
+                               save_path: Optional[Union[str, BinaryIO]],
+                               ax: Optional[Any] = None) -> Any:
         """Create a time per call plot using matplotlib."""
-        fig, ax = plt.subplots(figsize=self.fig_size)
+        if ax is None:
+            fig, ax = plt.subplots(figsize=self.fig_size)
+        else:
+            fig = ax.figure
         
         # Create a horizontal bar chart
         y_pos = range(len(func_names))
@@ -424,11 +444,11 @@ class CPUVisualizer:
             ax.text(v + 0.01 * max(times_per_call), i, f'{v:.6f}s', va='center')
             
         # Adjust layout
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save the figure if requested
         if save_path:
-            plt.savefig(save_path, bbox_inches='tight')
+            self._save_mpl(fig, save_path)
             
         # Show the figure if requested
         if show:
@@ -440,7 +460,7 @@ class CPUVisualizer:
                                   func_names: List[str],
                                   times_per_call: List[float],
                                   show: bool,
-                                  save_path: Optional[str]) -> Any:
+                                  save_path: Optional[Union[str, BinaryIO]]) -> Any:
         """Create a time per call plot using plotly."""
         # Set the template based on the theme
         template = 'plotly_dark' if self.theme == 'dark' else 'plotly_white'
@@ -479,15 +499,19 @@ class CPUVisualizer:
         
     def save_interactive_html(self,
                              profile_data: Dict,
-                             filename: str,
-                             include_all: bool = True) -> None:
+                             filename: Optional[Union[str, os.PathLike, TextIO]] = None,
+                             include_all: bool = True) -> Optional[str]:
         """
         Create an interactive HTML report with profiling visualizations.
         
         Args:
             profile_data: CPU profiling data (from CPUProfiler.get_stats())
-            filename: Path to save the HTML file to
+            filename: Path, or text file object, to save the HTML to; if None,
+                the HTML is returned instead
             include_all: Whether to include all plot types
+            
+        Returns:
+            The HTML document if filename is None, otherwise None
         """
         if not _HAS_PLOTLY:
             raise ImportError(
@@ -496,7 +520,8 @@ class CPUVisualizer:
             )
             
         # Ensure the directory exists
-        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
+        if filename is not None and not hasattr(filename, 'write'):
+            os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
         
         # Force backend to plotly for HTML output
         old_backend = self.backend
@@ -543,11 +568,17 @@ class CPUVisualizer:
                 showlegend=False
             )
             
-            # Write the combined figure to HTML
-            combined_fig.write_html(filename)
+            report_fig = combined_fig
         else:
-            # Just write the first figure to HTML
-            fig1.write_html(filename)
+            # Just report the first figure
+            report_fig = fig1
             
         # Restore the original backend
         self.backend = old_backend
+        
+        # Return the HTML when there is nowhere to write it
+        if filename is None:
+            return report_fig.to_html()
+            
+        report_fig.write_html(filename)
+        return None
@@ -6,7 +6,11 @@ using various chart types and formats.
 """
 
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from pyperfoptimizer.visualizer.common import MatplotlibSaveMixin
 
 # Try to import visualization libraries
 try:
@@ -23,7 +27,7 @@ try:
 except ImportError:
     _HAS_PLOTLY = False
 
-class MemoryVisualizer:
+class MemoryVisualizer(MatplotlibSaveMixin):
     """
     A class for visualizing memory profiling results.
     
@@ -82,16 +86,19 @@ class MemoryVisualizer:
     def plot_memory_usage(self, 
                          profile_data: Dict,
                          show: bool = True,
-                         save_path: Optional[str] = None,
-                         include_baseline: bool = True) -> Any:
+                         save_path: Optional[Union[str, BinaryIO]] = None,
+                         include_baseline: bool = True,
+                         ax: Optional[Any] = None) -> Any:
         """
         Plot memory usage over time.
         
         Args:
             profile_data: Memory profiling data (from MemoryProfiler.get_stats())
             show: Whether to display the plot
-            save_path: Path to save the plot to (optional)
+            save_path: Path, or binary file object, to save the plot to (optional)
             include_baseline: Whether to include a baseline line
+            ax: Matplotlib axes to draw into instead of a new figure
+                (matplotlib backend only, optional)
             
         Returns:
             The figure object
@@ -99,17 +106,16 @@ class MemoryVisualizer:
         if not profile_data:
             raise ValueError("Invalid profile data.")
             
-        # Extract memory usage data
-        timestamps = profile_data.get('timestamps', [])
-        memory_mb = profile_data.get('memory_mb', [])
+        # Extract memory usage data as float64 arrays; lists and arrays
+        # are both accepted
+        timestamps = np.asarray(profile_data.get('timestamps', []), dtype=np.float64)
+        memory_mb = np.asarray(profile_data.get('memory_mb', []), dtype=np.float64)
         
-        if not timestamps or not memory_mb or len(timestamps) != len(memory_mb):
+        if not timestamps.size or not memory_mb.size or len(timestamps) != len(memory_mb):
             raise ValueError("Invalid memory data format.")
             
         # Adjust timestamps to start from 0
-        if timestamps:
-            start_time = timestamps[0]
-            timestamps = [t - start_time for t in timestamps]
+        timestamps = timestamps - timestamps[0]
             
         # Get baseline if available
         baseline = profile_data.get('baseline_memory', None)
@@ -118,7 +124,7 @@ class MemoryVisualizer:
         if self.backend == 'matplotlib':
             return self._plot_memory_usage_mpl(
                 timestamps, memory_mb, baseline if include_baseline else None,
-                show, save_path
+                show, save_path, ax
             )
         else:  # plotly
             return self._plot_memory_usage_plotly(
@@ -127,13 +133,17 @@ class MemoryVisualizer:
             )
             
     def _plot_memory_usage_mpl(self, 
-                              timestamps: List[float],
-                              memory_mb: List[float],
+                              timestamps: np.ndarray,
+                              memory_mb: np.ndarray,
                               baseline: Optional[float],
                               show: bool,
-                              save_path: Optional[str]) -> Any:
+                              save_path: Optional[Union[str, BinaryIO]],
+                              ax: Optional[Any] = None) -> Any:
         """Create a memory usage plot using matplotlib."""
-        fig, ax = plt.subplots(figsize=self.fig_size)
+        if ax is None:
+            fig, ax = plt.subplots(figsize=self.fig_size)
+        else:
+            fig = ax.figure
         
         # Plot the memory usage line
         ax.plot(timestamps, memory_mb, '-', label='Memory Usage', linewidth=2)
@@ -153,8 +163,8 @@ class MemoryVisualizer:
         ax.legend()
         
         # Add memory stats
-        if memory_mb:
-            peak_memory = max(memory_mb)
+        if memory_mb.size:
+            peak_memory = memory_mb.max()
             text = f"Peak: {peak_memory:.2f} MB\n"
             
             if baseline is not None:
@@ -165,11 +175,11 @@ class MemoryVisualizer:
                    verticalalignment='top', bbox=props)
             
         # Adjust layout
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save the figure if requested
         if save_path:
-            plt.savefig(save_path, bbox_inches='tight')
+            self._save_mpl(fig, save_path)
             
         # Show the figure if requested
         if show:
@@ -178,11 +188,11 @@ class MemoryVisualizer:
         return fig
         
     def _plot_memory_usage_plotly(self, 
-                                 timestamps: List[float],
-                                 memory_mb: List[float],
+                                 timestamps: np.ndarray,
+                                 memory_mb: np.ndarray,
                                  baseline: Optional[float],
                                  show: bool,
-                                 save_path: Optional[str]) -> Any:
+                                 save_path: Optional[Union[str, BinaryIO]]) -> Any:
         """Create a memory usage plot using plotly."""
         # Set the template based on the theme
         template = 'plotly_dark' if self.theme == 'dark' else 'plotly_white'
@@ -210,8 +220,8 @@ class MemoryVisualizer:
             ))
             
         # Add memory stats annotation
-        if memory_mb:
-            peak_memory = max(memory_mb)
+        if memory_mb.size:
+            peak_memory = memory_mb.max()
             annotation_text = f"Peak: {peak_memory:.2f} MB<br>"
             
             if baseline is not None:
@@ -262,7 +272,8 @@ class MemoryVisualizer:
                         line_profile_data: Dict,
                         top_n: int = 10,
                         show: bool = True,
-                        save_path: Optional[str] = None) -> Any:
+                        save_path: Optional[Union[str, BinaryIO]] = None,
+                        ax: Optional[Any] = None) -> Any:
         """
         Plot memory usage by line.
         
@@ -270,7 +281,9 @@ class MemoryVisualizer:
             line_profile_data: Line-by-line memory profiling data
             top_n: Number of top lines to display
             show: Whether to display the plot
-            save_path: Path to save the plot to (optional)
+            save_path: Path, or binary file object, to save the plot to (optional)
+            ax: Matplotlib axes to draw into instead of a new figure
+                (matplotlib backend only, optional)
             
         Returns:
             The figure object
@@ -304,7 +317,7 @@ class MemoryVisualizer:
         
         # Create the figure based on the backend
         if self.backend == 'matplotlib':
-            return self._plot_line_memory_mpl(labels, increments, show, save_path)
+            return self._plot_line_memory_mpl(labels, increments, show, save_path, ax)
         else:  # plotly
             return self._plot_line_memory_plotly(labels, increments, show, save_path)
             
@@ -312,9 +325,13 @@ class MemoryVisualizer:
                              labels: List[str],
                              increments: List[float],
                              show: bool,
-                             save_path: Optional[str]) -> Any:
+                             save_path: Optional[Union[str, BinaryIO]],
+                             ax: Optional[Any] = None) -> Any:
         """Create a line memory plot using matplotlib."""
-        fig, ax = plt.subplots(figsize=self.fig_size)
+        if ax is None:
+            fig, ax = plt.subplots(figsize=self.fig_size)
+        else:
+            fig = ax.figure
         
         # Create a horizontal bar chart
         y_pos = range(len(labels))
@@ -339,11 +356,11 @@ class MemoryVisualizer:
         ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
         
         # Adjust layout
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save the figure if requested
         if save_path:
-            plt.savefig(save_path, bbox_inches='tight')
+            self._save_mpl(fig, save_path)
             
         # Show the figure if requested
         if show:
@@ -355,7 +372,7 @@ class MemoryVisualizer:
                                 labels: List[str],
                                 increments: List[float],
                                 show: bool,
-                                save_path: Optional[str]) -> Any:
+                                save_path: Optional[Union[str, BinaryIO]]) -> Any:
         """Create a line memory plot using plotly."""
         # Set the template based on the theme
         template = 'plotly_dark' if self.theme == 'dark' else 'plotly_white'
@@ -411,14 +428,18 @@ class MemoryVisualizer:
     def save_interactive_html(self,
                              profile_data: Dict,
                              line_data: Optional[Dict] = None,
-                             filename: str = "memory_profile.html") -> None:
+                             filename: Optional[Union[str, os.PathLike, TextIO]] = "memory_profile.html") -> Optional[str]:
         """
         Create an interactive HTML report with memory profiling visualizations.
         
         Args:
             profile_data: Memory profiling data
             line_data: Line-by-line memory profiling data (optional)
-            filename: Path to save the HTML file to
+            filename: Path, or text file object, to save the HTML to; if None,
+                the HTML is returned instead
+            
+        Returns:
+            The HTML document if filename is None, otherwise None
         """
         if not _HAS_PLOTLY:
             raise ImportError(
@@ -427,7 +448,8 @@ class MemoryVisualizer:
             )
             
         # Ensure the directory exists
-        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
+        if filename is not None and not hasattr(filename, 'write'):
+            os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
         
         # Force backend to plotly for HTML output
         old_backend = self.backend
@@ -470,11 +492,17 @@ class MemoryVisualizer:
                 showlegend=False
             )
             
-            # Write the combined figure to HTML
-            combined_fig.write_html(filename)
+            report_fig = combined_fig
         else:
-            # Just write the first figure to HTML
-            fig1.write_html(filename)
+            # Just report the first figure
+            report_fig = fig1
             
         # Restore the original backend
         self.backend = old_backend
+        
+        # Return the HTML when there is nowhere to write it
+        if filename is None:
+            return report_fig.to_html()
+            
+        report_fig.write_html(filename)
+        return None
@@ -5,8 +5,12 @@ This module provides tools for creating timeline visualizations of profiling
 results, showing the execution flow and timing of functions.
 """
 
-import os
-from typing import Any, Dict, List, Optional, Tuple
+import heapq
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
 
 # Try to import visualization libraries
 try:
@@ -20,10 +24,32 @@ except ImportError:
 try:
     import plotly.express as px
     import plotly.graph_objects as go
+    import plotly.io as pio
     _HAS_PLOTLY = True
 except ImportError:
     _HAS_PLOTLY = False
 
+# Serialize figures with orjson when available; it encodes NumPy arrays
+# directly instead of going through Python lists like the stdlib encoder
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+@contextmanager
+def _orjson_engine():
+    """Serialize plotly figures with orjson for the duration of the block."""
+    if not (_HAS_PLOTLY and _HAS_ORJSON):
+        yield
+        return
+    previous = pio.json.config.default_engine
+    pio.json.config.default_engine = 'orjson'
+    try:
+        yield
+    finally:
+        pio.json.config.default_engine = previous
+
 class TimelineVisualizer:
     """
     A class for creating timeline visualizations of profiling results.
@@ -73,6 +99,12 @@ class TimelineVisualizer:
         self.theme = theme
         self.fig_size = fig_size
         
+        # Resolve the plotly template once instead of on every figure
+        if _HAS_PLOTLY:
+            self._template = pio.templates['plotly_dark' if theme == 'dark' else 'plotly_white']
+        else:
+            self._template = None
+        
         # Set up the theme for matplotlib
         if self.backend == 'matplotlib':
             if theme == 'dark':
@@ -100,75 +132,99 @@ class TimelineVisualizer:
         if not call_data:
             raise ValueError("No call data provided")
             
+        # Convert the per-call records to parallel arrays once
+        calls = self._call_data_to_arrays(call_data)
+            
         # Create the figure based on the backend
         if self.backend == 'matplotlib':
-            return self._create_function_timeline_mpl(call_data, show, save_path)
+            return self._create_function_timeline_mpl(calls, show, save_path)
         else:  # plotly
-            return self._create_function_timeline_plotly(call_data, show, save_path)
+            return self._create_function_timeline_plotly(calls, show, save_path)
+            
+    def _call_data_to_arrays(self, call_data: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Convert function call records into parallel NumPy arrays.
+        
+        Args:
+            call_data: List of dictionaries containing function call information
+            
+        Returns:
+            Dictionary with 'names', 'starts', 'ends', 'durations' and 'depths'
+            arrays (one entry per call), 'rows' giving each call's y position,
+            and 'labels' holding the function names in order of first appearance
+        """
+        count = len(call_data)
+        starts = np.fromiter((c['start'] for c in call_data), dtype=np.float64, count=count)
+        ends = np.fromiter((c['end'] for c in call_data), dtype=np.float64, count=count)
+        depths = np.fromiter((c['depth'] for c in call_data), dtype=np.float64, count=count)
+        names = np.array([c['name'] for c in call_data], dtype=object)
+        
+        # Assign y positions to functions based on call order
+        labels, first_seen, inverse = np.unique(names, return_index=True, return_inverse=True)
+        order = np.argsort(first_seen)
+        positions = np.empty_like(order)
+        positions[order] = np.arange(len(order))
+        
+        return {
+            'names': names,
+            'starts': starts,
+            'ends': ends,
+            'durations': ends - starts,
+            'depths': depths,
+            'rows': positions[inverse.ravel()],
+            'labels': labels[order],
+        }
             
     def _create_function_timeline_mpl(self, 
-                                     call_data: List[Dict],
+                                     calls: Dict[str, np.ndarray],
                                      show: bool,
                                      save_path: Optional[str]) -> Any:
         """Create a function timeline plot using matplotlib."""
         fig, ax = plt.subplots(figsize=self.fig_size)
         
+        starts = calls['starts']
+        durations = calls['durations']
+        depths = calls['depths']
+        rows = calls['rows']
+        labels = calls['labels']
+        
         # Define colors for different depths
-        colors = plt.cm.viridis(
-            [c['depth'] / max(1, max(c['depth'] for c in call_data)) for c in call_data]
-        )
+        max_depth = depths.max()
+        colors = plt.cm.viridis(depths / max(1, max_depth))
         
         # Get the time range
-        min_time = min(c['start'] for c in call_data)
-        max_time = max(c['end'] for c in call_data)
-        
-        # Assign y positions to functions based on call order
-        y_positions = {}
-        current_position = 0
+        min_time = starts.min()
+        max_time = calls['ends'].max()
+        offsets = starts - min_time
+        
+        # Draw one bar per function call
+        ax.barh(
+            rows,
+            durations,
+            left=offsets,
+            height=0.8,
+            linewidth=1,
+            edgecolor='black',
+            color=colors,
+            alpha=0.7
+        )
         
-        for call in call_data:
-            name = call['name']
-            if name not in y_positions:
-                y_positions[name] = current_position
-                current_position += 1
-                
-        # Plot rectangles for each function call
-        for i, call in enumerate(call_data):
-            name = call['name']
-            start = call['start']
-            end = call['end']
-            depth = call['depth']
-            
-            y_pos = y_positions[name]
-            duration = end - start
-            
-            # Create rectangle for the function call
-            rect = patches.Rectangle(
-                (start - min_time, y_pos - 0.4),
-                duration,
-                0.8,
-                linewidth=1,
-                edgecolor='black',
-                facecolor=colors[i],
-                alpha=0.7
+        # Add function names in the middle of bars that are wide enough
+        text_threshold = len(depths) / 2
+        for i in np.flatnonzero(durations > (max_time - min_time) * 0.05):
+            ax.text(
+                offsets[i] + durations[i] / 2,
+                rows[i],
+                calls['names'][i],
+                ha='center',
+                va='center',
+                fontsize=8,
+                color='white' if depths[i] > text_threshold else 'black'
             )
-            ax.add_patch(rect)
-            
-            # Add function name in the middle of the rectangle if it's wide enough
-            if duration > (max_time - min_time) * 0.05:
-                ax.text(
-                    start - min_time + duration / 2,
-                    y_pos,
-                    name,
-                    ha='center',
-                    va='center',
-                    fontsize=8,
-                    color='white' if depth > len(call_data) / 2 else 'black'
-                )
                 
         # Set y-ticks to function names
-        ax.set_yticks(list(y_positions.values()))
-        ax.set_yticklabels(list(y_positions.keys()))
+        ax.set_yticks(np.arange(len(labels)))
+        ax.set_yticklabels(labels)
         
         # Set x-axis and title
         ax.set_xlabel('Time (seconds)')
@@ -178,12 +234,12 @@ class TimelineVisualizer:
         ax.set_xlim(-0.05 * (max_time - min_time), (max_time - min_time) * 1.05)
         
         # Set y limits with some padding
-        ax.set_ylim(-1, len(y_positions))
+        ax.set_ylim(-1, len(labels))
         
         # Add a colorbar to show depth
         sm = plt.cm.ScalarMappable(
             cmap=plt.cm.viridis,
-            norm=plt.Normalize(0, max(c['depth'] for c in call_data))
+            norm=plt.Normalize(0, max_depth)
         )
         sm.set_array([])
         cbar = plt.colorbar(sm, ax=ax)
@@ -203,71 +259,42 @@ class TimelineVisualizer:
         return fig
         
     def _create_function_timeline_plotly(self, 
-                                        call_data: List[Dict],
+                                        calls: Dict[str, np.ndarray],
                                         show: bool,
                                         save_path: Optional[str]) -> Any:
         """Create a function timeline plot using plotly."""
-        # Set the template based on the theme
-        template = 'plotly_dark' if self.theme == 'dark' else 'plotly_white'
-        
         # Get the time range
-        min_time = min(c['start'] for c in call_data)
-        max_time = max(c['end'] for c in call_data)
+        min_time = calls['starts'].min()
+        max_time = calls['ends'].max()
+        labels = calls['labels']
         
-        # Normalize all times to start from 0
-        for call in call_data:
-            call['start'] = call['start'] - min_time
-            call['end'] = call['end'] - min_time
-            
-        # Assign y positions to functions based on call order
-        y_positions = {}
-        current_position = 0
+        # Skip very short calls for clarity
+        visible = calls['durations'] >= (max_time - min_time) * 0.001
+        names = calls['names'][visible]
+        durations = calls['durations'][visible]
         
-        for call in call_data:
-            name = call['name']
-            if name not in y_positions:
-                y_positions[name] = current_position
-                current_position += 1
-                
-        # Create the timeline figure
+        # Add a single bar trace holding every visible call, with all
+        # times normalized to start from 0
         fig = go.Figure()
-        
-        # Get the maximum depth for color scaling
-        max_depth = max(c['depth'] for c in call_data) if call_data else 1
-        
-        # Add a bar for each function call
-        for call in call_data:
-            name = call['name']
-            start = call['start']
-            end = call['end']
-            depth = call['depth']
-            duration = end - start
-            
-            # Skip very short calls for clarity
-            if duration < (max_time - min_time) * 0.001:
-                continue
-                
-            # Add the bar
-            fig.add_trace(go.Bar(
-                x=[duration],
-                y=[list(y_positions.keys()).index(name)],
-                orientation='h',
-                base=start,
-                width=0.8,
-                name=name,
-                text=f"{name} ({duration:.6f}s)",
-                marker=dict(
-                    color=depth,
-                    colorscale='Viridis',
-                    cmin=0,
-                    cmax=max_depth,
-                    colorbar=dict(
-                        title="Call Depth"
-                    )
-                ),
-                showlegend=False,
-                hoverinfo='text'
-            ))
+        fig.add_trace(go.Bar(
+            x=durations,
+            y=calls['rows'][visible],
+            orientation='h',
+            base=calls['starts'][visible] - min_time,
+            width=0.8,
+            text=[f"{name} ({duration:.6f}s)" for name, duration in zip(names, durations)],
+            marker=dict(
+                color=calls['depths'][visible],
+                colorscale='Viridis',
+                cmin=0,
+                cmax=calls['depths'].max(),
+                colorbar=dict(
+                    title="Call Depth"
+                )
+            ),
+            showlegend=False,
+            hoverinfo='text'
+        ))
             
         # Update layout
         fig.update_layout(
@@ -276,13 +303,12 @@ class TimelineVisualizer:
             yaxis=dict(
                 title='Function',
                 tickmode='array',
-                tickvals=list(range(len(y_positions))),
-                ticktext=list(y_positions.keys())
+                tickvals=np.arange(len(labels)),
+                ticktext=list(labels)
             ),
-            template=template,
+            template=self._template,
             height=self.fig_size[1] * 100,
             width=self.fig_size[0] * 100,
-            barmode='stack',
             bargap=0.15,
         )
         
@@ -481,9 +507,6 @@ class TimelineVisualizer:
                                            show: bool,
                                            save_path: Optional[str]) -> Any:
         """Create a comparative timeline plot using plotly."""
-        # Set the template based on the theme
-        template = 'plotly_dark' if self.theme == 'dark' else 'plotly_white'
-        
         # Process baseline data
         min_time_baseline = min(c['start'] for c in baseline_data)
         for call in baseline_data:
@@ -576,7 +599,7 @@ class TimelineVisualizer:
         # Update layout
         fig.update_layout(
             title=f"Performance Comparison (Speedup: {speedup:.2f}x)",
-            template=template,
+            template=self._template,
             height=self.fig_size[1] * 100,
             width=self.fig_size[0] * 100,
             legend=dict(
@@ -648,7 +671,8 @@ class TimelineVisualizer:
     def create_call_graph(self, 
                          call_hierarchy: Dict,
                          show: bool = True,
-                         save_path: Optional[str] = None) -> Any:
+                         save_path: Optional[str] = None,
+                         max_nodes: Optional[int] = 500) -> Any:
         """
         Create a call graph visualization showing function call relationships.
         
@@ -664,6 +688,8 @@ class TimelineVisualizer:
                 }
             show: Whether to display the plot
             save_path: Path to save the plot to (optional)
+            max_nodes: Maximum number of nodes to draw; larger graphs are
+                reduced to the slowest functions (None to draw all nodes)
             
         Returns:
             The figure object
@@ -705,6 +731,15 @@ class TimelineVisualizer:
         
         # Get node times for sizing
         times = nx.get_node_attributes(G, 'time')
+        
+        # Large graphs are unusable interactively, so keep only the slowest nodes
+        note = None
+        total_nodes = G.number_of_nodes()
+        if max_nodes is not None and total_nodes > max_nodes:
+            top = heapq.nlargest(max_nodes, times.items(), key=lambda item: item[1])
+            times = dict(top)
+            G = G.subgraph(times).copy()
+            note = f"Showing top {max_nodes} of {total_nodes} nodes by time"
         max_time = max(times.values()) if times else 1.0
         
         # Scale node sizes based on time
@@ -712,15 +747,16 @@ class TimelineVisualizer:
         
         # Create the figure based on the backend
         if self.backend == 'matplotlib':
-            return self._create_call_graph_mpl(G, node_sizes, show, save_path)
+            return self._create_call_graph_mpl(G, node_sizes, show, save_path, note)
         else:  # plotly
-            return self._create_call_graph_plotly(G, node_sizes, show, save_path)
+            return self._create_call_graph_plotly(G, node_sizes, show, save_path, note)
             
     def _create_call_graph_mpl(self, 
                               G, 
                               node_sizes: Dict[str, float],
                               show: bool,
-                              save_path: Optional[str]) -> Any:
+                              save_path: Optional[str],
+                              note: Optional[str] = None) -> Any:
         """Create a call graph using matplotlib and networkx."""
         import networkx as nx
         
@@ -773,6 +809,10 @@ class TimelineVisualizer:
         # Set the title
         ax.set_title('Function Call Graph')
         
+        # Note when the graph was truncated
+        if note:
+            ax.text(0.01, 0.01, note, transform=ax.transAxes, fontsize=8)
+        
         # Remove axis
         ax.axis('off')
         
@@ -793,16 +833,14 @@ class TimelineVisualizer:
                                  G, 
                                  node_sizes: Dict[str, float],
                                  show: bool,
-                                 save_path: Optional[str]) -> Any:
+                                 save_path: Optional[str],
+                                 note: Optional[str] = None) -> Any:
         """Create a call graph using plotly."""
         try:
             import networkx as nx
         except ImportError:
             raise ImportError("NetworkX is required for call graph visualization")
             
-        # Set the template based on the theme
-        template = 'plotly_dark' if self.theme == 'dark' else 'plotly_white'
-        
         # Create a layout for the graph
         try:
             # Try to use a hierarchical layout if graphviz is available
@@ -811,59 +849,73 @@ class TimelineVisualizer:
             # Fall back to spring layout
             pos = nx.spring_layout(G)
             
-        # Create edge traces
+        # Collect edge coordinates; NaN separates the individual line segments
+        edge_x = []
+        edge_y = []
+        for edge in G.edges():
+            x0, y0 = pos[edge[0]]
+            x1, y1 = pos[edge[1]]
+            edge_x.extend((x0, x1, np.nan))
+            edge_y.extend((y0, y1, np.nan))
+            
+        # Collect node positions and attributes
+        times = nx.get_node_attributes(G, 'time')
+        nodes = list(G.nodes())
+        node_x = np.asarray([pos[node][0] for node in nodes], dtype=np.float64)
+        node_y = np.asarray([pos[node][1] for node in nodes], dtype=np.float64)
+        node_size = np.asarray([node_sizes[node] for node in nodes], dtype=np.float64)
+        node_time = np.asarray([times.get(node, 0) for node in nodes], dtype=np.float64)
+        node_text = [f"{node}<br>{time:.4f}s" for node, time in zip(nodes, node_time)]
+        
+        # Create edge trace
         edge_trace = go.Scatter(
-            x=[],
-            y=[],
+            x=np.asarray(edge_x, dtype=np.float64),
+            y=np.asarray(edge_y, dtype=np.float64),
             line=dict(width=1, color='#888'),
             hoverinfo='none',
             mode='lines'
         )
         
-        # Add edges
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_trace['x'] += (x0, x1, None)
-            edge_trace['y'] += (y0, y1, None)
-            
         # Create node trace
         node_trace = go.Scatter(
-            x=[],
-            y=[],
-            text=[],
+            x=node_x,
+            y=node_y,
+            text=node_text,
             mode='markers+text',
             hoverinfo='text',
             marker=dict(
                 showscale=True,
                 colorscale='YlGnBu',
-                size=[],
-                color=[],
+                size=node_size,
+                color=node_time,
                 colorbar=dict(
                     thickness=15,
-                    title='Execution Time (s)',
-                    xanchor='left',
-                    titleside='right'
+                    title=dict(text='Execution Time (s)', side='right'),
+                    xanchor='left'
                 ),
                 line=dict(width=2)
             ),
             textposition='bottom center'
         )
-        
-        # Add nodes
-        for node in G.nodes():
-            x, y = pos[node]
-            node_trace['x'] += (x,)
-            node_trace['y'] += (y,)
             
-        # Add node attributes
-        times = nx.get_node_attributes(G, 'time')
-        
-        for node in G.nodes():
-            time = times.get(node, 0)
-            node_trace['marker']['size'] += (node_sizes[node],)
-            node_trace['marker']['color'] += (time,)
-            node_trace['text'] += (f"{node}<br>{time:.4f}s",)
+        annotations = [
+            dict(
+                text="Node size indicates execution time",
+                showarrow=False,
+                xref="paper", yref="paper",
+                x=0.01, y=-0.01
+            )
+        ]
+        
+        # Note when the graph was truncated
+        if note:
+            annotations.append(dict(
+                text=note,
+                showarrow=False,
+                xref="paper", yref="paper",
+                x=0.99, y=-0.01,
+                xanchor='right'
+            ))
             
         # Create the figure
         fig = go.Figure(
@@ -873,17 +925,10 @@ class TimelineVisualizer:
                 showlegend=False,
                 hovermode='closest',
                 margin=dict(b=20, l=5, r=5, t=40),
-                annotations=[
-                    dict(
-                        text="Node size indicates execution time",
-                        showarrow=False,
-                        xref="paper", yref="paper",
-                        x=0.01, y=-0.01
-                    )
-                ],
+                annotations=annotations,
                 xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
                 yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                template=template,
+                template=self._template,
                 height=self.fig_size[1] * 100,
                 width=self.fig_size[0] * 100,
             )
@@ -902,7 +947,8 @@ class TimelineVisualizer:
     def save_interactive_html(self,
                              call_data: List[Dict],
                              call_hierarchy: Optional[Dict] = None,
-                             filename: str = "timeline_profile.html") -> None:
+                             filename: str = "timeline_profile.html",
+                             include_plotlyjs: Union[bool, str] = 'cdn') -> None:
         """
         Create an interactive HTML report with timeline visualizations.
         
@@ -910,6 +956,9 @@ class TimelineVisualizer:
             call_data: List of dictionaries containing function call information
             call_hierarchy: Dictionary of function call relationships (optional)
             filename: Path to save the HTML file to
+            include_plotlyjs: How the report loads plotly.js. 'cdn' references the
+                matching plotly.js release instead of embedding the multi-megabyte
+                bundle; pass True to embed it for offline viewing.
         """
         if not _HAS_PLOTLY:
             raise ImportError(
@@ -918,7 +967,8 @@ class TimelineVisualizer:
             )
             
         # Ensure the directory exists
-        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
+        out = Path(filename)
+        out.parent.mkdir(parents=True, exist_ok=True)
         
         # Force backend to plotly for HTML output
         old_backend = self.backend
@@ -963,19 +1013,24 @@ class TimelineVisualizer:
                     title='Execution Timeline Analysis',
                     height=1200,
                     width=1000,
-                    template='plotly_dark' if self.theme == 'dark' else 'plotly_white',
+                    template=self._template,
                     showlegend=False
                 )
                 
-                # Write the combined figure to HTML
-                combined_fig.write_html(filename)
+                report_fig = combined_fig
             except Exception as e:
                 # Fall back to just the timeline if call graph fails
                 print(f"Warning: Failed to create call graph: {str(e)}")
-                fig1.write_html(filename)
+                report_fig = fig1
         else:
             # Just write the timeline to HTML
-            fig1.write_html(filename)
+            report_fig = fig1
+            
+        # Render the page once; the traces were already validated when the
+        # figures were built. plotly.io.write_html takes no engine argument,
+        # so orjson is only selected while this report is written
+        with _orjson_engine():
+            pio.write_html(report_fig, str(out), include_plotlyjs=include_plotlyjs, validate=False)
             
         # Restore the original backend
         self.backend = old_backend
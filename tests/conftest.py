@@ -0,0 +1,36 @@
+"""
+Shared pytest configuration for the PyPerfOptimizer tests.
+
+The optional dependency probes below run once per test session; test
+modules import the flags from here instead of repeating the imports.
+"""
+
+import importlib
+
+import pytest
+
+
+def _probe(module_name: str) -> bool:
+    """Return whether an optional dependency can be imported."""
+    try:
+        importlib.import_module(module_name)
+        return True
+    except ImportError:
+        return False
+
+
+HAS_MPL = _probe('matplotlib')
+HAS_PLOTLY = _probe('plotly')
+HAS_KALEIDO = _probe('kaleido')
+HAS_MEMORY_PROFILER = _probe('memory_profiler')
+HAS_NETWORKX = _probe('networkx')
+
+if HAS_MPL:
+    import matplotlib
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _agg_backend():
+    """Select the non-interactive Agg backend once per test process."""
+    if HAS_MPL and matplotlib.get_backend().lower() != 'agg':
+        matplotlib.use('Agg', force=True)
@@ -3,23 +3,32 @@ Tests for the code analyzer component of PyPerfOptimizer.
 """
 
 import ast
-import os
-import tempfile
+import pickle
 import unittest
+from unittest import mock
 
-from pyperfoptimizer.optimizer.code_analyzer import CodeAnalyzer, CodeVisitor
+import pytest
+
+from pyperfoptimizer.optimizer import code_analyzer as code_analyzer_module
+from pyperfoptimizer.optimizer.code_analyzer import CodeAnalyzer, CodeVisitor, IssueType
 
 
 class TestCodeAnalyzer(unittest.TestCase):
     """Test cases for the CodeAnalyzer class."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Set up a single analyzer shared by all tests."""
+        cls.analyzer = CodeAnalyzer()
+        
     def setUp(self):
-        """Set up test fixtures."""
-        self.analyzer = CodeAnalyzer()
+        """Clear state left over from the previous test."""
+        self.analyzer.reset()
         
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.analyzer = None
+    @pytest.fixture(autouse=True)
+    def _use_tmp_path(self, tmp_path):
+        """Give each test its own pytest-managed temporary directory."""
+        self.tmp_path = tmp_path
         
     def test_analyze_code(self):
         """Test analyzing code for optimization opportunities."""
@@ -91,19 +100,14 @@ def inefficient_function(data, threshold=0):
         self.assertIn('loops', results)
         
         # It should find the range(len()) pattern
-        found_range_len = False
-        for issue in results['issues']:
-            if 'range(len(' in issue.get('message', ''):
-                found_range_len = True
-                break
-                
-        self.assertTrue(found_range_len, "Should detect the range(len()) pattern")
+        self.assertIn(IssueType.RANGE_LEN, results['issues_by_type'],
+                      "Should detect the range(len()) pattern")
         
     def test_analyze_file(self):
         """Test analyzing a Python file for optimization opportunities."""
         # Create a temporary file with some code
-        with tempfile.NamedTemporaryFile(suffix='.py', delete=False) as tmp:
-            tmp.write(b"""
+        file_path = self.tmp_path / 'sample.py'
+        file_path.write_bytes(b"""
 def inefficient_file_function(items):
     # Inefficient list creation
     total = 0
@@ -115,41 +119,45 @@ def inefficient_file_function(items):
     
     return total, sum(squares)
 """)
-            file_path = tmp.name
-            
-        try:
-            results = self.analyzer.analyze_file(file_path)
-            
-            # Check that the basic structure is correct
-            self.assertIsInstance(results, dict)
-            self.assertIn('issues', results)
-            self.assertIn('issue_counts', results)
-            self.assertIn('construct_counts', results)
-            self.assertIn('imported_modules', results)
-            self.assertIn('defined_functions', results)
-            self.assertIn('loops', results)
-            self.assertIn('comprehensions', results)
-            
-            # Check that it found the function
-            self.assertEqual(len(results['defined_functions']), 1)
-            self.assertIn('inefficient_file_function', results['defined_functions'])
+        
+        results = self.analyzer.analyze_file(str(file_path))
+        
+        # Check that the basic structure is correct
+        self.assertIsInstance(results, dict)
+        self.assertIn('issues', results)
+        self.assertIn('issue_counts', results)
+        self.assertIn('construct_counts', results)
+        self.assertIn('imported_modules', results)
+        self.assertIn('defined_functions', results)
+        self.assertIn('loops', results)
+        self.assertIn('comprehensions', results)
+        
+        # Check that it found the function
+        self.assertEqual(len(results['defined_functions']), 1)
+        self.assertIn('inefficient_file_function', results['defined_functions'])
+        
+        # Check that it found a comprehension
+        self.assertGreater(len(results['comprehensions']), 0)
+        
+        # Check that it found the len() in loop issue
+        self.assertIn(IssueType.LEN_IN_LOOP, results['issues_by_type'],
+                      "Should detect len() calls inside a loop")
+        
+    def test_analyze_files(self):
+        """Test analyzing several files in worker processes."""
+        file_paths = []
+        for i in range(3):
+            file_path = self.tmp_path / f'module_{i}.py'
+            file_path.write_text(f"def func_{i}(items):\n    for item in items:\n        print(len(item))\n")
+            file_paths.append(str(file_path))
             
-            # Check that it found a comprehension
-            self.assertGreater(len(results['comprehensions']), 0)
+        results = CodeAnalyzer.analyze_files(file_paths, workers=2)
+        
+        self.assertEqual(list(results), file_paths)
+        for i, file_path in enumerate(file_paths):
+            self.assertIn(f'func_{i}', results[file_path]['defined_functions'])
+            self.assertEqual(len(results[file_path]['loops']), 1)
             
-            # Check that it found the len() in loop issue
-            found_len_in_loop = False
-            for issue in results['issues']:
-                if 'len() inside a loop' in issue.get('message', ''):
-                    found_len_in_loop = True
-                    break
-                    
-            self.assertTrue(found_len_in_loop, "Should detect len() calls inside a loop")
-        finally:
-            # Clean up
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-                
     def test_get_optimization_opportunities(self):
         """Test getting optimization opportunities."""
         # Analyze code with opportunities
@@ -209,6 +217,85 @@ def unused_function():
         self.assertEqual(len(self.analyzer.loops), 0)
         self.assertEqual(len(self.analyzer.defined_functions), 0)
 
+    def test_repeated_analysis(self):
+        """Test that analyzing the same code twice gives independent results."""
+        code = "def example(data):\n    for i in range(len(data)):\n        pass"
+        first = self.analyzer.analyze_code(code)
+
+        # Mutating one result must not leak into later analyses of the same code
+        first['loops'].clear()
+        first['issues'].append({'severity': 'info', 'message': 'extra'})
+
+        second = CodeAnalyzer().analyze_code(code)
+        self.assertEqual(len(second['loops']), 1)
+        self.assertNotIn('extra', [issue['message'] for issue in second['issues']])
+
+    def test_cached_analysis_copied_on_reuse(self):
+        """Test that cached results are only copied when they are reused."""
+        code = "def copied_on_reuse(items):\n    return [item for item in items]"
+        with mock.patch.object(code_analyzer_module.pickle, 'loads', wraps=pickle.loads) as loads:
+            first = CodeAnalyzer().analyze_code(code)
+            self.assertEqual(loads.call_count, 0)
+            
+            second = CodeAnalyzer().analyze_code(code)
+            self.assertEqual(loads.call_count, 1)
+            
+        self.assertEqual(first['comprehensions'], second['comprehensions'])
+        self.assertIsNot(first['comprehensions'], second['comprehensions'])
+        
+    def test_opportunities_by_issue_type(self):
+        """Test filtering optimization opportunities by issue type."""
+        code = "def example(data=[]):\n    for i in range(len(data)):\n        pass"
+        self.analyzer.analyze_code(code)
+        
+        # Every issue is indexed under its type
+        for issue in self.analyzer.issues:
+            self.assertIn(issue, self.analyzer.issues_by_type[issue['type']])
+            
+        opportunities = self.analyzer.get_optimization_opportunities(issue_types=[IssueType.RANGE_LEN])
+        issue_messages = [opp['message'] for opp in opportunities if opp['type'] == 'issue']
+        self.assertEqual(len(issue_messages), 1)
+        self.assertIn('range(len(', issue_messages[0])
+        
+    def test_pattern_issues(self):
+        """Test issues for code patterns, each reported once at its first line."""
+        code = (
+            "LIMIT = 10\n"
+            "def build(items):\n"
+            "    text = ''\n"
+            "    for item in items:\n"
+            "        text += item\n"
+            "        text += str(len(items))\n"
+            "    return text, list(range(LIMIT))\n"
+        )
+        issues_by_type = self.analyzer.analyze_code(code)['issues_by_type']
+        
+        expected_lines = {
+            IssueType.GLOBAL_VARIABLES: 1,
+            IssueType.STRING_CONCAT_IN_LOOP: 5,
+            IssueType.REPEATED_LEN_IN_LOOP: 6,
+            IssueType.LIST_OF_RANGE: 7,
+        }
+        for issue_type, line in expected_lines.items():
+            self.assertEqual([issue['line'] for issue in issues_by_type[issue_type]], [line])
+
+    def test_counter_in_loop_not_string_concat(self):
+        """Test that numeric += in loops is not reported as string concatenation."""
+        code = (
+            "i = 0\n"
+            "total = 0\n"
+            "while i < 10:\n"
+            "    i += 1\n"
+            "    total += i\n"
+        )
+        issues_by_type = self.analyzer.analyze_code(code)['issues_by_type']
+        self.assertNotIn(IssueType.STRING_CONCAT_IN_LOOP, issues_by_type)
+        
+        # A string literal on the right-hand side is reported
+        code = "for item in items:\n    label += f'{item},'\n"
+        issues_by_type = self.analyzer.analyze_code(code)['issues_by_type']
+        self.assertEqual([issue['line'] for issue in issues_by_type[IssueType.STRING_CONCAT_IN_LOOP]], [2])
+
 class TestCodeVisitor(unittest.TestCase):
     """Test cases for the CodeVisitor class."""
 
@@ -275,6 +362,16 @@ class TestCodeVisitor(unittest.TestCase):
         # Second loop should be nested
         self.assertEqual(visitor.loops[1]['nested'], True)
         
+    def test_visit_sibling_loops(self):
+        """Test that consecutive loops are not reported as nested."""
+        code = "for i in range(5):\n  while i: i -= 1\nfor j in range(5): print(j)"
+        tree = ast.parse(code)
+        visitor = CodeVisitor()
+        visitor.visit(tree)
+        
+        self.assertEqual([loop['nested'] for loop in visitor.loops], [False, True, False])
+        self.assertEqual(visitor.loop_depth, 0)
+        
     def test_visit_while(self):
         """Test the While node visitor."""
         code = "i = 0\nwhile i < 10: i += 1"
@@ -3,7 +3,9 @@ Tests for the recommendations component of PyPerfOptimizer.
 """
 
 import unittest
+from unittest import mock
 
+from pyperfoptimizer.optimizer import recommendations as recommendations_module
 from pyperfoptimizer.optimizer.recommendations import Recommendations
 
 
@@ -61,17 +63,20 @@ class TestRecommendations(unittest.TestCase):
         # Check that the top function was identified
         self.assertTrue(any('sort_data' in rec for rec in recommendations))
         
+        # Each recommendation is classified once, so checks are tag lookups
+        tagged = {tag: rec.text for rec in self.recommender.records['cpu'] for tag in rec.tags}
+        
         # Check for specific recommendations about sorting
-        self.assertTrue(any('sort' in rec.lower() and 'algorithm' in rec.lower() 
-                           for rec in recommendations))
-                           
+        self.assertIn('sort', tagged)
+        self.assertIn('sort_data', tagged['sort'])
+        
         # Check for I/O recommendations
-        self.assertTrue(any('I/O' in rec and 'read_file' in rec 
-                           for rec in recommendations))
-                           
+        self.assertIn('io', tagged)
+        self.assertIn('read_file', tagged['io'])
+        
         # Check for string processing recommendations
-        self.assertTrue(any('string' in rec.lower() and 'process_strings' in rec 
-                           for rec in recommendations))
+        self.assertIn('string', tagged)
+        self.assertIn('process_strings', tagged['string'])
         
     def test_generate_from_memory_profile(self):
         """Test generating recommendations from memory profile data."""
@@ -95,15 +100,43 @@ class TestRecommendations(unittest.TestCase):
         self.assertIsInstance(recommendations, list)
         self.assertGreater(len(recommendations), 0)
         
+        lowered = [rec.lower() for rec in recommendations]
+        
         # Check for memory leak recommendation
-        self.assertTrue(any('memory leak' in rec.lower() for rec in recommendations))
+        self.assertTrue(any('memory leak' in rec for rec in lowered))
         
         # Check for high peak memory recommendation
-        self.assertTrue(any('peak memory' in rec.lower() and '600.0' in rec 
-                           for rec in recommendations))
+        self.assertTrue(any('peak memory' in rec and '600.0' in rec for rec in lowered))
                            
         # Check for memory growth recommendation
-        self.assertTrue(any('growth rate' in rec.lower() for rec in recommendations))
+        self.assertTrue(any('growth rate' in rec for rec in lowered))
+        
+    def test_generate_from_memory_trace_only(self):
+        """Test generating memory recommendations from the raw trace alone."""
+        memory_data = {
+            'timestamps': [0.0, 1.0, 2.0, 3.0],
+            'memory_mb': [100.0, 300.0, 500.0, 700.0]
+        }
+        
+        recommendations = self.recommender.generate_from_memory_profile(memory_data)
+        
+        lowered = [rec.lower() for rec in recommendations]
+        
+        # Peak, growth and steady-growth checks fall back to the trace
+        self.assertTrue(any('peak memory' in rec and '700.00' in rec for rec in lowered))
+        self.assertTrue(any('growth rate' in rec for rec in lowered))
+        self.assertTrue(any('grew steadily' in rec and '200.00 MB/s' in rec for rec in recommendations))
+        
+    def test_generate_from_memory_trace_negligible_growth(self):
+        """Test that a trace growing by a few bytes is not reported as a leak."""
+        memory_data = {
+            'timestamps': [0.0, 1.0, 2.0, 3.0],
+            'memory_mb': [100.0, 100.0, 100.00001, 100.00002]
+        }
+        
+        recommendations = self.recommender.generate_from_memory_profile(memory_data)
+        
+        self.assertFalse(any('grew steadily' in rec for rec in recommendations))
         
     def test_generate_from_line_profile(self):
         """Test generating recommendations from line profile data."""
@@ -149,11 +182,13 @@ class TestRecommendations(unittest.TestCase):
         self.assertIsInstance(recommendations, list)
         self.assertGreater(len(recommendations), 0)
         
+        lowered = [rec.lower() for rec in recommendations]
+        
         # Check for hotspot recommendation
-        self.assertTrue(any('Hotspot at line 12' in rec for rec in recommendations))
+        self.assertTrue(any('hotspot at line 12' in rec for rec in lowered))
         
         # Check for loop optimization recommendation (range(len()))
-        self.assertTrue(any('loop at line 12' in rec.lower() for rec in recommendations))
+        self.assertTrue(any('loop at line 12' in rec for rec in lowered))
         
     def test_generate_from_code_analysis(self):
         """Test generating recommendations from code analysis results."""
@@ -195,17 +230,19 @@ class TestRecommendations(unittest.TestCase):
         self.assertIsInstance(recommendations, list)
         self.assertGreater(len(recommendations), 0)
         
+        lowered = [rec.lower() for rec in recommendations]
+        
         # Check for string concatenation issue
-        self.assertTrue(any('String concatenation in a loop' in rec for rec in recommendations))
+        self.assertTrue(any('string concatenation in a loop' in rec for rec in lowered))
         
         # Check for unnecessary list conversion issue
-        self.assertTrue(any('Unnecessary list conversion of range()' in rec for rec in recommendations))
+        self.assertTrue(any('unnecessary list conversion of range()' in rec for rec in lowered))
         
         # Check for nested loops recommendation
-        self.assertTrue(any('nested loops' in rec.lower() for rec in recommendations))
+        self.assertTrue(any('nested loops' in rec for rec in lowered))
         
         # Check for unused functions recommendation
-        self.assertTrue(any('unused functions' in rec.lower() for rec in recommendations))
+        self.assertTrue(any('unused functions' in rec for rec in lowered))
         
     def test_generate_all(self):
         """Test generating all recommendations from various data sources."""
@@ -277,6 +314,62 @@ class TestRecommendations(unittest.TestCase):
         # Check that they're formatted with category prefix
         self.assertTrue(all(rec.startswith('[') for rec in prioritized))
         
+        # The hotspot recommendation has the highest priority
+        self.assertIn('main.process', prioritized[0])
+        
+    def test_get_prioritized_recommendations_by_tag(self):
+        """Test filtering prioritized recommendations by tag."""
+        memory_data = {
+            'peak_memory': 600.0,
+            'memory_increase': 450.0
+        }
+        self.recommender.generate_from_memory_profile(memory_data)
+        
+        prioritized = self.recommender.get_prioritized_recommendations(tags={'leak'})
+        self.assertEqual(len(prioritized), 1)
+        self.assertTrue(prioritized[0].startswith('[MEMORY] Potential memory leak'))
+        
+    def test_generate_from_large_cpu_profile(self):
+        """Test that every function of a large profile is checked, but only hotspots are classified."""
+        functions = [
+            {'function': f'module.load_{i}', 'ncalls': '4/1' if i % 40 == 0 else '1',
+             'tottime': 0.01, 'cumtime': 1.0 / (i + 1)}
+            for i in range(250)
+        ]
+        recommendations = self.recommender.generate_from_cpu_profile({'total_time': 0.5, 'functions': functions})
+        
+        self.assertEqual(sum('is recursive' in rec for rec in recommendations), 7)
+        self.assertEqual(sum('I/O operations' in rec for rec in recommendations), 5)
+        
+    def test_generate_from_cpu_profile_missing_function_name(self):
+        """Test that records without a function name are reported as unknown."""
+        recommendations = self.recommender.generate_from_cpu_profile({
+            'functions': [{'ncalls': '1/1', 'tottime': 1}]
+        })
+        
+        self.assertIn("Focus optimization efforts on top time-consuming function: unknown", recommendations)
+        self.assertTrue(any(rec.startswith("Function unknown is recursive") for rec in recommendations))
+        
+    def test_cpu_profile_cache(self):
+        """Test that repeated CPU analyses of the same profile are memoized."""
+        cpu_data = {
+            'total_time': 2.0,
+            'functions': [
+                {'function': 'main.sort_items', 'ncalls': '3/1', 'tottime': 1.0, 'cumtime': 2.0}
+            ]
+        }
+        
+        # Cache every analysis regardless of how long it took
+        with mock.patch.object(recommendations_module, '_CPU_CACHE_MIN_SECONDS', 0):
+            first = self.recommender.generate_from_cpu_profile(cpu_data)
+            self.recommender.reset()
+            second = self.recommender.generate_from_cpu_profile(cpu_data)
+            
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(self.recommender.records['cpu']), len(second))
+        self.assertEqual(len(self.recommender._cpu_cache), 1)
+        
     def test_reset(self):
         """Test resetting recommendations."""
         # Generate some recommendations
@@ -2,24 +2,55 @@
 Tests for the CPU profiler component of PyPerfOptimizer.
 """
 
+import json
 import os
-import tempfile
+import pickle
 import time
 import unittest
+from unittest import mock
 
-from pyperfoptimizer.profiler.cpu_profiler import CPUProfiler
+import pytest
+
+try:
+    import numba
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+from pyperfoptimizer.profiler import cpu_profiler as cpu_profiler_module
+from pyperfoptimizer.profiler.cpu_profiler import CPUProfiler, FuncStat
+
+
+def fib_iter(n):
+    """Iterative Fibonacci, a single call with real work for the profiler."""
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+# Compile with Numba when it is available; without an on-disk cache so the
+# tests leave no cache files behind
+if _HAS_NUMBA:
+    fib_iter = numba.njit(cache=False)(fib_iter)
 
 
 class TestCPUProfiler(unittest.TestCase):
     """Test cases for the CPUProfiler class."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.profiler = CPUProfiler()
+    @pytest.fixture(autouse=True)
+    def _set_tmp(self, tmp_path):
+        """Give each test a temporary directory managed by pytest."""
+        self.tmp_path = tmp_path
         
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.profiler = None
+    @classmethod
+    def setUpClass(cls):
+        """Set up a single profiler shared by all tests."""
+        cls.profiler = CPUProfiler()
+        
+    def setUp(self):
+        """Clear results left over from the previous test."""
+        self.profiler.clear()
         
     def test_start_stop(self):
         """Test starting and stopping the profiler."""
@@ -35,15 +66,12 @@ class TestCPUProfiler(unittest.TestCase):
         
     def test_profile_func(self):
         """Test profiling a function."""
-        def fibonacci(n):
-            if n <= 1:
-                return n
-            return fibonacci(n-1) + fibonacci(n-2)
-        
-        result = self.profiler.profile_func(fibonacci, 20)
+        # fib(90) fits in int64 (fib(92) is the largest that does), so the
+        # Numba-compiled version returns the same value
+        result = self.profiler.profile_func(fib_iter, 90)
         
         # Check that the function's result is correct
-        self.assertEqual(result, 6765)
+        self.assertEqual(result, 2880067194370816120)
         
         # Check that profiling data was captured
         stats = self.profiler.get_stats()
@@ -78,6 +106,33 @@ class TestCPUProfiler(unittest.TestCase):
         self.assertIn('cumtime', func)
         self.assertIn('function', func)
         
+    def test_func_stat(self):
+        """Test the FuncStat record returned for each function."""
+        self.profiler.profile_func(sum, range(1000))
+        func = self.profiler.get_stats()['functions'][0]
+        
+        self.assertIsInstance(func, FuncStat)
+        self.assertIsInstance(func, dict)
+        self.assertEqual(func['cumtime'], func.cumtime)
+        self.assertEqual(func.get('missing', 'default'), 'default')
+        self.assertEqual(func.as_dict()['function'], func.function)
+        with self.assertRaises(KeyError):
+            func['missing']
+        with self.assertRaises(AttributeError):
+            func.missing
+            
+        # Records stay writable, without affecting later calls
+        func['note'] = 'checked'
+        self.assertNotIn('note', self.profiler.get_stats()['functions'][0])
+        
+    def test_stats_json_serializable(self):
+        """Test that the statistics encode as JSON without a default hook."""
+        self.profiler.profile_func(sum, range(1000))
+        stats = self.profiler.get_stats()
+        
+        decoded = json.loads(json.dumps(stats))
+        self.assertEqual(decoded['functions'], [dict(func) for func in stats['functions']])
+        
     def test_save_load_stats(self):
         """Test saving and loading profiling statistics."""
         def example_function():
@@ -87,27 +142,21 @@ class TestCPUProfiler(unittest.TestCase):
         self.profiler.profile_func(example_function)
         
         # Save stats to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.prof') as temp:
-            temp_path = temp.name
-            
-        try:
-            # Save stats
-            self.profiler.save_stats(temp_path)
-            self.assertTrue(os.path.exists(temp_path))
-            
-            # Create a new profiler and load stats
-            new_profiler = CPUProfiler()
-            new_profiler.load_stats(temp_path)
-            
-            # Check that the loaded stats match the original
-            original_stats = self.profiler.get_stats()
-            loaded_stats = new_profiler.get_stats()
-            
-            self.assertEqual(len(original_stats['functions']), len(loaded_stats['functions']))
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        temp_path = str(self.tmp_path / 'stats.prof')
+        
+        # Save stats
+        self.profiler.save_stats(temp_path)
+        self.assertTrue(os.path.exists(temp_path))
+        
+        # Create a new profiler and load stats
+        new_profiler = CPUProfiler()
+        new_profiler.load_stats(temp_path)
+        
+        # Check that the loaded stats match the original
+        original_stats = self.profiler.get_stats()
+        loaded_stats = new_profiler.get_stats()
+        
+        self.assertEqual(len(original_stats['functions']), len(loaded_stats['functions']))
                 
     def test_get_top_functions(self):
         """Test getting the top N functions by cumulative time."""
@@ -151,6 +200,50 @@ class TestCPUProfiler(unittest.TestCase):
         # Check that results were cleared
         with self.assertRaises(Exception):
             self.profiler.results.print_stats()  # This should raise since results is None
+            
+    def test_stats_cache(self):
+        """Test that parsed statistics are reused until the results change."""
+        def simple_func():
+            return sum(range(1000))
+            
+        self.profiler.profile_func(simple_func)
+        stats = self.profiler.get_stats()
+        with mock.patch.object(cpu_profiler_module, '_func_stat') as func_stat:
+            self.assertEqual(self.profiler.get_stats()['functions'], stats['functions'])
+            func_stat.assert_not_called()
+            
+        # Callers get their own dictionary
+        stats['total_time'] = -1
+        self.assertNotEqual(self.profiler.get_stats()['total_time'], -1)
+        
+        # The timestamp records when the statistics were requested
+        with mock.patch.object(cpu_profiler_module, 'datetime') as dt:
+            dt.now.return_value.isoformat.return_value = 'later'
+            self.assertEqual(self.profiler.get_stats()['timestamp'], 'later')
+        
+        # A new profiling run produces fresh statistics
+        self.profiler.profile_func(simple_func)
+        self.assertNotEqual(self.profiler.get_stats()['functions'], stats['functions'])
+        
+        # So does assigning the results directly
+        results = self.profiler.results
+        self.profiler.results = None
+        self.assertEqual(self.profiler.get_stats(), {})
+        self.profiler.results = results
+        self.assertGreater(len(self.profiler.get_stats()['functions']), 0)
+        
+    def test_function_list(self):
+        """Test that the function records are returned as a plain list."""
+        self.profiler.profile_func(sorted, list(range(1000, 0, -1)))
+        functions = self.profiler.get_stats()['functions']
+        
+        self.assertIsInstance(functions, list)
+        self.assertEqual(pickle.loads(pickle.dumps(functions)), functions)
+        self.assertEqual(self.profiler.get_top_functions(1), [max(functions, key=lambda f: f.cumtime)])
+        
+        # Changing the returned list does not affect later calls
+        functions.clear()
+        self.assertGreater(len(self.profiler.get_stats()['functions']), 0)
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,10 +3,11 @@ Tests for the line profiler component of PyPerfOptimizer.
 """
 
 import os
-import sys
-import tempfile
+import pickle
 import unittest
 
+import pytest
+
 try:
     import line_profiler
     _HAS_LINE_PROFILER = True
@@ -20,16 +21,22 @@ from pyperfoptimizer.profiler.line_profiler import LineProfiler
 class TestLineProfiler(unittest.TestCase):
     """Test cases for the LineProfiler class."""
 
-    def setUp(self):
-        """Set up test fixtures."""
+    @pytest.fixture(autouse=True)
+    def _set_tmp(self, tmp_path):
+        """Give each test a temporary directory managed by pytest."""
+        self.tmp_path = tmp_path
+        
+    @classmethod
+    def setUpClass(cls):
+        """Set up a single profiler shared by all tests."""
         try:
-            self.profiler = LineProfiler()
+            cls.profiler = LineProfiler()
         except ImportError:
-            self.skipTest("line_profiler not installed")
+            raise unittest.SkipTest("line_profiler not installed")
         
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.profiler = None
+    def setUp(self):
+        """Clear results left over from the previous test."""
+        self.profiler.clear()
         
     def test_add_function(self):
         """Test adding a function to profile."""
@@ -49,17 +56,17 @@ class TestLineProfiler(unittest.TestCase):
         
     def test_profile_func(self):
         """Test profiling a function."""
-        def fibonacci(n):
-            """Recursive Fibonacci implementation."""
-            if n <= 1:  # Base case
-                return n
-            else:  # Recursive case
-                return fibonacci(n-1) + fibonacci(n-2)
+        def fib_iter(n):
+            """Iterative Fibonacci implementation."""
+            a, b = 0, 1
+            for _ in range(n):
+                a, b = b, a + b
+            return a
         
-        result = self.profiler.profile_func(fibonacci, 10)
+        result = self.profiler.profile_func(fib_iter, 90)
         
         # Check that the function's result is correct
-        self.assertEqual(result, 55)
+        self.assertEqual(result, 2880067194370816120)
         
         # Check that profiling data was captured
         stats = self.profiler.get_stats()
@@ -162,10 +169,6 @@ class TestLineProfiler(unittest.TestCase):
         
     def test_save_load_stats(self):
         """Test saving and loading profiling statistics."""
-        # Skip this test if there are compatibility issues with pickle
-        if sys.version_info >= (3, 10):
-            self.skipTest("Save/load profiling stats test skipped on Python 3.10+")
-            
         def example_function():
             """A simple function to profile."""
             result = 0
@@ -176,31 +179,42 @@ class TestLineProfiler(unittest.TestCase):
         self.profiler.profile_func(example_function)
         
         # Save stats to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.lprof') as temp:
-            temp_path = temp.name
-            
-        try:
-            # Save stats
-            self.profiler.save_stats(temp_path)
-            self.assertTrue(os.path.exists(temp_path))
-            
-            # Check that we can load the stats in a new profiler
-            try:
-                new_profiler = LineProfiler()
-                new_profiler.load_stats(temp_path)
-                
-                # Get stats to verify they loaded correctly
-                loaded_stats = new_profiler.get_stats()
-                self.assertIn('functions', loaded_stats)
-            except Exception as e:
-                # Loading stats can be platform/version dependent for line_profiler
-                # so we'll skip rather than fail if it doesn't work
-                self.skipTest(f"Failed to load line profiler stats: {str(e)}")
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        temp_path = str(self.tmp_path / 'stats.lprof')
+        
+        # Save stats
+        self.profiler.save_stats(temp_path)
+        self.assertTrue(os.path.exists(temp_path))
+        
+        # Check that we can load the stats in a new profiler
+        new_profiler = LineProfiler()
+        new_profiler.load_stats(temp_path)
+        
+        # Get stats to verify they loaded correctly
+        loaded_stats = new_profiler.get_stats()
+        self.assertIn('functions', loaded_stats)
+        function_names = [func['function_name'] for func in loaded_stats['functions']]
+        self.assertTrue(any(name.endswith('example_function') for name in function_names))
                 
+    def test_load_pickled_stats(self):
+        """Test that stats pickled by earlier versions are rejected clearly."""
+        temp_path = self.tmp_path / 'old_stats.pkl'
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'functions': []}, f)
+            
+        with self.assertRaises(ValueError) as ctx:
+            LineProfiler().load_stats(str(temp_path))
+        self.assertIn('pickled by earlier versions', str(ctx.exception))
+        
+    def test_save_unsupported_results(self):
+        """Test that results without raw timings are not saved."""
+        profiler = LineProfiler()
+        profiler.results = {'unknown': 'format'}
+        temp_path = self.tmp_path / 'stats.lprof'
+        
+        with self.assertRaises(ValueError):
+            profiler.save_stats(str(temp_path))
+        self.assertFalse(temp_path.exists())
+        
     def test_clear(self):
         """Test clearing profiling results."""
         def simple_func():
@@ -2,44 +2,50 @@
 Tests for the memory profiler component of PyPerfOptimizer.
 """
 
-import json
-import os
+import copy
+import io
 import sys
-import tempfile
-import time
 import unittest
 
 try:
-    import memory_profiler
-    _HAS_MEMORY_PROFILER = True
+    import orjson as _json
 except ImportError:
-    _HAS_MEMORY_PROFILER = False
+    import json as _json
+
+from tests.conftest import HAS_MEMORY_PROFILER
 
 from pyperfoptimizer.profiler.memory_profiler import MemoryProfiler
 
 
-@unittest.skipUnless(_HAS_MEMORY_PROFILER, "memory_profiler not installed")
+@unittest.skipUnless(HAS_MEMORY_PROFILER, "memory_profiler not installed")
 class TestMemoryProfiler(unittest.TestCase):
     """Test cases for the MemoryProfiler class."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        try:
-            self.profiler = MemoryProfiler(interval=0.01)
-        except ImportError:
-            self.skipTest("memory_profiler not installed")
+    @classmethod
+    def setUpClass(cls):
+        """Set up a single profiler shared by all tests."""
+        cls.profiler = MemoryProfiler(interval=0.01)
+        
+        # Profile once for the tests that only inspect the results
+        cls._sample_profiler = MemoryProfiler(interval=0.01)
+        cls._sample_profiler.profile_func(lambda: [0] * 500000)
+        
+    @classmethod
+    def tearDownClass(cls):
+        """Release the shared profiler's resources."""
+        cls.profiler.cleanup()
+        cls._sample_profiler.cleanup()
         
-    def tearDown(self):
-        """Tear down test fixtures."""
-        if hasattr(self, 'profiler'):
-            self.profiler.cleanup()
-            self.profiler = None
+    def setUp(self):
+        """Clear results left over from the previous test."""
+        self.profiler.clear()
         
     def test_start_stop(self):
         """Test starting and stopping the profiler."""
         self.profiler.start()
-        time.sleep(0.1)  # Do something that takes time
+        data = [0] * 500000  # Allocate memory while profiling
         self.profiler.stop()
+        del data
         
         # Make sure profiling data was captured
         stats = self.profiler.get_stats()
@@ -54,7 +60,6 @@ class TestMemoryProfiler(unittest.TestCase):
         def memory_intensive_func():
             """A function that allocates memory."""
             large_list = [0] * 1000000
-            time.sleep(0.1)
             return sum(large_list)
         
         result = self.profiler.profile_func(memory_intensive_func)
@@ -70,14 +75,7 @@ class TestMemoryProfiler(unittest.TestCase):
         
     def test_get_stats(self):
         """Test retrieving profiling statistics."""
-        def allocate_memory():
-            """Allocate and return a large list."""
-            large_list = [0] * 1000000
-            time.sleep(0.1)
-            return large_list
-        
-        self.profiler.profile_func(allocate_memory)
-        stats = self.profiler.get_stats()
+        stats = self._sample_profiler.get_stats()
         
         # Check that the stats contain expected keys
         self.assertIn('timestamps', stats)
@@ -99,43 +97,28 @@ class TestMemoryProfiler(unittest.TestCase):
         
     def test_save_load_stats(self):
         """Test saving and loading profiling statistics."""
-        def example_function():
-            """Allocate memory and sleep."""
-            large_list = [0] * 500000
-            time.sleep(0.1)
-            return large_list
+        # Save stats to an in-memory buffer
+        buf = io.BytesIO()
+        self._sample_profiler.save_stats(buf)
+        self.assertGreater(buf.tell(), 0)
+        
+        # Check buffer content
+        buf.seek(0)
+        content = _json.loads(buf.read())
+        self.assertIn('timestamps', content)
+        self.assertIn('memory_mb', content)
+            
+        # Create a new profiler and load stats
+        buf.seek(0)
+        new_profiler = MemoryProfiler()
+        new_profiler.load_stats(buf)
         
-        self.profiler.profile_func(example_function)
+        # Check that the loaded stats match the original
+        original_stats = self._sample_profiler.get_stats()
+        loaded_stats = new_profiler.get_stats()
         
-        # Save stats to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as temp:
-            temp_path = temp.name
-            
-        try:
-            # Save stats
-            self.profiler.save_stats(temp_path)
-            self.assertTrue(os.path.exists(temp_path))
-            
-            # Check file content
-            with open(temp_path, 'r') as f:
-                content = json.load(f)
-                self.assertIn('timestamps', content)
-                self.assertIn('memory_mb', content)
-                
-            # Create a new profiler and load stats
-            new_profiler = MemoryProfiler()
-            new_profiler.load_stats(temp_path)
-            
-            # Check that the loaded stats match the original
-            original_stats = self.profiler.get_stats()
-            loaded_stats = new_profiler.get_stats()
-            
-            self.assertEqual(len(original_stats['timestamps']), len(loaded_stats['timestamps']))
-            self.assertEqual(len(original_stats['memory_mb']), len(loaded_stats['memory_mb']))
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        self.assertEqual(len(original_stats['timestamps']), len(loaded_stats['timestamps']))
+        self.assertEqual(len(original_stats['memory_mb']), len(loaded_stats['memory_mb']))
                 
     def test_profile_line_by_line(self):
         """Test line-by-line memory profiling."""
@@ -184,21 +167,18 @@ class TestMemoryProfiler(unittest.TestCase):
             
     def test_clear(self):
         """Test clearing profiling results."""
-        def simple_func():
-            """A simple function that allocates some memory."""
-            data = [0] * 100000
-            time.sleep(0.05)
-            return sum(data)
-            
-        self.profiler.profile_func(simple_func)
-        stats_before = self.profiler.get_stats()
+        # clear() only rebinds attributes, so a shallow copy keeps the
+        # shared sample intact
+        profiler = copy.copy(self._sample_profiler)
+        stats_before = profiler.get_stats()
         self.assertGreater(len(stats_before.get('memory_mb', [])), 0)
         
         # Clear the results
-        self.profiler.clear()
+        profiler.clear()
         
         # Check that results were cleared
-        self.assertIsNone(self.profiler.results)
+        self.assertIsNone(profiler.results)
+        self.assertIsNotNone(self._sample_profiler.results)
 
 if __name__ == '__main__':
     unittest.main()
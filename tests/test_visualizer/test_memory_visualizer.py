@@ -2,35 +2,17 @@
 Tests for the memory visualizer component of PyPerfOptimizer.
 """
 
-import os
-import tempfile
+import io
 import unittest
 
-try:
-    import matplotlib
-    matplotlib.use('Agg')  # Use non-interactive backend for testing
-    import matplotlib.pyplot as plt
-    _HAS_MPL = True
-except ImportError:
-    _HAS_MPL = False
-
-try:
-    import plotly
-    _HAS_PLOTLY = True
-except ImportError:
-    _HAS_PLOTLY = False
+import numpy as np
+import pytest
 
-try:
-    import kaleido
-    _HAS_KALEIDO = True
-except ImportError:
-    _HAS_KALEIDO = False
+from tests.conftest import HAS_KALEIDO, HAS_MEMORY_PROFILER, HAS_MPL, HAS_PLOTLY
 
-try:
-    import memory_profiler
-    _HAS_MEMORY_PROFILER = True
-except ImportError:
-    _HAS_MEMORY_PROFILER = False
+if HAS_MPL:
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend for testing
 
 from pyperfoptimizer.visualizer.memory_visualizer import MemoryVisualizer
 
@@ -39,8 +21,8 @@ def generate_sample_memory_data():
     """Generate sample memory profile data for testing."""
     # Create sample memory profile data
     return {
-        'timestamps': [0.0, 0.1, 0.2, 0.3, 0.4, 0.5],
-        'memory_mb': [100.0, 110.0, 120.0, 115.0, 105.0, 100.0],
+        'timestamps': np.array([0.0, 0.1, 0.2, 0.3, 0.4, 0.5], dtype=np.float64),
+        'memory_mb': np.array([100.0, 110.0, 120.0, 115.0, 105.0, 100.0], dtype=np.float64),
         'duration': 0.5,
         'baseline_memory': 100.0,
         'peak_memory': 120.0,
@@ -79,128 +61,166 @@ def generate_sample_line_data():
         'raw_output': 'Sample output'
     }
 
-@unittest.skipUnless(_HAS_MPL or _HAS_PLOTLY, "Neither matplotlib nor plotly is installed")
+# Built once per module; the visualizer only reads the sample data, and
+# the arrays are made read-only so an accidental write fails loudly
+_SAMPLE_MEMORY = generate_sample_memory_data()
+_SAMPLE_MEMORY['timestamps'].setflags(write=False)
+_SAMPLE_MEMORY['memory_mb'].setflags(write=False)
+_SAMPLE_LINE = generate_sample_line_data()
+
+# Visualization backends available in this environment, matplotlib first
+_BACKENDS = [
+    backend for backend, available in (('matplotlib', HAS_MPL), ('plotly', HAS_PLOTLY))
+    if available
+]
+
+@unittest.skipUnless(HAS_MPL or HAS_PLOTLY, "Neither matplotlib nor plotly is installed")
 class TestMemoryVisualizer(unittest.TestCase):
     """Test cases for the MemoryVisualizer class."""
 
+    @pytest.fixture(autouse=True)
+    def _set_tmp(self, tmp_path):
+        """Give each test a temporary directory managed by pytest."""
+        self.tmp_path = tmp_path
+        
+    @classmethod
+    def setUpClass(cls):
+        """Create one matplotlib figure shared by all tests."""
+        cls._fig, cls._ax = None, None
+        if HAS_MPL:
+            # Imported lazily so collecting the module stays cheap
+            import matplotlib.pyplot as plt
+            cls._fig, cls._ax = plt.subplots()
+        
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared figure."""
+        if HAS_MPL:
+            import matplotlib.pyplot as plt
+            plt.close('all')
+            
     def setUp(self):
         """Set up test fixtures."""
-        # Determine which backend to use for testing
-        if _HAS_PLOTLY:
-            backend = 'plotly'
-        elif _HAS_MPL:
-            backend = 'matplotlib'
-        else:
-            self.skipTest("No visualization backend available")
+        # The plot tests run once per available backend
+        self.visualizers = {
+            backend: MemoryVisualizer(backend=backend, theme='light')
+            for backend in _BACKENDS
+        }
+        for visualizer in self.visualizers.values():
+            # Tests only check that something was written, so skip PNG encoding
+            visualizer._fast_save = True
             
-        self.visualizer = MemoryVisualizer(backend=backend, theme='light')
-        self.sample_data = generate_sample_memory_data()
-        self.sample_line_data = generate_sample_line_data()
+        # Other tests use a single backend, preferring matplotlib since Agg
+        # rendering is much cheaper than building plotly figures
+        self.visualizer = next(iter(self.visualizers.values()))
+        # The visualizer only reads the sample data, so tests share it
+        self.sample_data = _SAMPLE_MEMORY
+        self.sample_line_data = _SAMPLE_LINE
+        
+    def _can_export(self, backend):
+        """Return whether figures of the backend can be saved as images here."""
+        return backend == 'matplotlib' or HAS_KALEIDO
         
     def tearDown(self):
         """Tear down test fixtures."""
+        self.visualizers = None
         self.visualizer = None
         self.sample_data = None
         
-        # Close any open matplotlib figures
-        if _HAS_MPL:
-            plt.close('all')
+        # Clear the shared axes for the next test
+        if HAS_MPL:
+            self._ax.cla()
         
-    @unittest.skipUnless(_HAS_KALEIDO, "kaleido required for image export")
     def test_plot_memory_usage(self):
-        """Test plotting memory usage over time."""
-        # Skip show to avoid blocking
-        fig = self.visualizer.plot_memory_usage(
-            self.sample_data, 
-            show=False,
-            include_baseline=True
+        """Test plotting memory usage over time with every available backend."""
+        for backend, visualizer in self.visualizers.items():
+            with self.subTest(backend=backend):
+                # Skip show to avoid blocking
+                fig = visualizer.plot_memory_usage(
+                    self.sample_data, 
+                    show=False,
+                    ax=self._ax,
+                    include_baseline=True
+                )
+                
+                self.assertIsNotNone(fig)
+                
+                # Test saving to an in-memory buffer
+                if self._can_export(backend):
+                    buf = io.BytesIO()
+                    visualizer.plot_memory_usage(
+                        self.sample_data,
+                        show=False,
+                        ax=self._ax,
+                        save_path=buf
+                    )
+                    self.assertGreater(buf.tell(), 0)
+                
+    def test_plot_line_memory(self):
+        """Test plotting memory usage by line with every available backend."""
+        for backend, visualizer in self.visualizers.items():
+            with self.subTest(backend=backend):
+                # Skip show to avoid blocking
+                fig = visualizer.plot_line_memory(
+                    self.sample_line_data, 
+                    top_n=3, 
+                    show=False,
+                    ax=self._ax
+                )
+                
+                self.assertIsNotNone(fig)
+                
+                # Test saving to an in-memory buffer
+                if self._can_export(backend):
+                    buf = io.BytesIO()
+                    visualizer.plot_line_memory(
+                        self.sample_line_data,
+                        show=False,
+                        ax=self._ax,
+                        save_path=buf
+                    )
+                    self.assertGreater(buf.tell(), 0)
+                
+    @unittest.skipUnless(HAS_PLOTLY, "Plotly is required for HTML reports")
+    def test_save_interactive_html(self):
+        """Test saving an interactive HTML report."""
+        # Force backend to plotly for HTML output
+        old_backend = self.visualizer.backend
+        self.visualizer.backend = 'plotly'
+        
+        # Get the HTML report back instead of writing a file
+        content = self.visualizer.save_interactive_html(
+            self.sample_data,
+            line_data=self.sample_line_data,
+            filename=None
         )
         
-        self.assertIsNotNone(fig)
+        # Restore original backend
+        self.visualizer.backend = old_backend
         
-        # Test saving to a temporary file
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            temp_path = tmp.name
-            
-        try:
-            self.visualizer.plot_memory_usage(
-                self.sample_data,
-                show=False,
-                save_path=temp_path
-            )
-            self.assertTrue(os.path.exists(temp_path))
-            self.assertGreater(os.path.getsize(temp_path), 0)
-        finally:
-            # Clean up
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        # Verify it contains some HTML elements we expect
+        self.assertIn('<html>', content)
+        self.assertIn('</html>', content)
+        self.assertIn('Plotly.newPlot', content)  # Plotly JavaScript call
                 
-    @unittest.skipUnless(_HAS_KALEIDO, "kaleido required for image export")
-    def test_plot_line_memory(self):
-        """Test plotting memory usage by line."""
-        # Skip show to avoid blocking
-        fig = self.visualizer.plot_line_memory(
-            self.sample_line_data, 
-            top_n=3, 
-            show=False
+    @unittest.skipUnless(HAS_PLOTLY, "Plotly is required for HTML reports")
+    def test_save_interactive_html_path(self):
+        """Test saving an HTML report to a path whose directories do not exist yet."""
+        old_backend = self.visualizer.backend
+        self.visualizer.backend = 'plotly'
+        
+        path = self.tmp_path / 'reports' / 'nested' / 'profile.html'
+        result = self.visualizer.save_interactive_html(
+            self.sample_data,
+            line_data=self.sample_line_data,
+            filename=path
         )
         
-        self.assertIsNotNone(fig)
+        self.visualizer.backend = old_backend
+        
+        self.assertIsNone(result)
+        self.assertTrue(path.exists())
         
-        # Test saving to a temporary file
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            temp_path = tmp.name
-            
-        try:
-            self.visualizer.plot_line_memory(
-                self.sample_line_data,
-                show=False,
-                save_path=temp_path
-            )
-            self.assertTrue(os.path.exists(temp_path))
-            self.assertGreater(os.path.getsize(temp_path), 0)
-        finally:
-            # Clean up
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-                
-    @unittest.skipUnless(_HAS_PLOTLY, "Plotly is required for HTML reports")
-    def test_save_interactive_html(self):
-        """Test saving an interactive HTML report."""
-        with tempfile.NamedTemporaryFile(suffix='.html', delete=False) as tmp:
-            temp_path = tmp.name
-            
-        try:
-            # Force backend to plotly for HTML output
-            old_backend = self.visualizer.backend
-            self.visualizer.backend = 'plotly'
-            
-            # Save HTML report
-            self.visualizer.save_interactive_html(
-                self.sample_data,
-                line_data=self.sample_line_data,
-                filename=temp_path
-            )
-            
-            # Restore original backend
-            self.visualizer.backend = old_backend
-            
-            # Check that the file was created and has content
-            self.assertTrue(os.path.exists(temp_path))
-            self.assertGreater(os.path.getsize(temp_path), 0)
-            
-            # Verify it contains some HTML elements we expect
-            with open(temp_path, 'r') as f:
-                content = f.read()
-                self.assertIn('<html>', content)
-                self.assertIn('<html>', content)
-                self.assertIn('</html>', content)
-                self.assertIn('Plotly.newPlot', content)  # Plotly JavaScript call
-        finally:
-            # Clean up
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-                
     def test_error_handling(self):
         """Test error handling with invalid data."""
         # Test with empty data
@@ -0,0 +1,127 @@
+"""
+Tests for the timeline visualizer component of PyPerfOptimizer.
+"""
+
+import copy
+import unittest
+
+import numpy as np
+import pytest
+
+from tests.conftest import HAS_MPL, HAS_NETWORKX, HAS_PLOTLY
+
+if HAS_MPL:
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend for testing
+
+if HAS_PLOTLY:
+    import plotly.io as pio
+
+from pyperfoptimizer.visualizer.timeline_visualizer import TimelineVisualizer
+
+
+def generate_sample_call_data():
+    """Generate sample function call records for testing."""
+    return [
+        {'name': 'main', 'start': 0.0, 'end': 1.0, 'depth': 0},
+        {'name': 'load', 'start': 0.1, 'end': 0.4, 'depth': 1},
+        {'name': 'parse', 'start': 0.2, 'end': 0.3, 'depth': 2},
+        {'name': 'load', 'start': 0.5, 'end': 0.7, 'depth': 1},
+        {'name': 'save', 'start': 0.8, 'end': 0.95, 'depth': 1}
+    ]
+
+def generate_sample_call_hierarchy(children=10):
+    """Generate a call hierarchy with a root calling `children` functions."""
+    return {
+        'name': 'main',
+        'time': 10.0,
+        'calls': [
+            {'name': f'func_{i}', 'time': 0.1 * (i + 1), 'calls': []}
+            for i in range(children)
+        ]
+    }
+
+
+@unittest.skipUnless(HAS_PLOTLY, "Plotly is required for the timeline tests")
+class TestTimelineVisualizer(unittest.TestCase):
+    """Test cases for the TimelineVisualizer class."""
+
+    @pytest.fixture(autouse=True)
+    def _set_tmp(self, tmp_path):
+        """Give each test a temporary directory managed by pytest."""
+        self.tmp_path = tmp_path
+        
+    def setUp(self):
+        """Set up test fixtures."""
+        self.visualizer = TimelineVisualizer(backend='plotly', theme='light')
+        self.call_data = generate_sample_call_data()
+        
+    def test_call_data_to_arrays(self):
+        """Test converting call records into parallel arrays."""
+        original = copy.deepcopy(self.call_data)
+        calls = self.visualizer._call_data_to_arrays(self.call_data)
+        
+        np.testing.assert_allclose(calls['starts'], [0.0, 0.1, 0.2, 0.5, 0.8])
+        np.testing.assert_allclose(calls['durations'], [1.0, 0.3, 0.1, 0.2, 0.15])
+        np.testing.assert_array_equal(calls['depths'], [0, 1, 2, 1, 1])
+        
+        # Rows follow the order in which functions first appear
+        self.assertEqual(list(calls['labels']), ['main', 'load', 'parse', 'save'])
+        np.testing.assert_array_equal(calls['rows'], [0, 1, 2, 1, 3])
+        
+        # The caller's records are left untouched
+        self.assertEqual(self.call_data, original)
+        
+    @unittest.skipUnless(HAS_NETWORKX, "networkx is required for call graphs")
+    def test_call_graph_max_nodes(self):
+        """Test that large call graphs are reduced to the slowest nodes."""
+        fig = self.visualizer.create_call_graph(
+            generate_sample_call_hierarchy(),
+            show=False,
+            max_nodes=3
+        )
+        
+        # Only the root and the two slowest children are drawn
+        node_trace = fig.data[1]
+        names = sorted(text.split('<br>')[0] for text in node_trace.text)
+        self.assertEqual(names, ['func_8', 'func_9', 'main'])
+        
+        # The truncation is noted on the figure
+        notes = [annotation.text for annotation in fig.layout.annotations]
+        self.assertIn("Showing top 3 of 11 nodes by time", notes)
+        
+    @unittest.skipUnless(HAS_NETWORKX, "networkx is required for call graphs")
+    def test_call_graph_all_nodes(self):
+        """Test that graphs within the node limit are drawn in full."""
+        fig = self.visualizer.create_call_graph(
+            generate_sample_call_hierarchy(),
+            show=False,
+            max_nodes=None
+        )
+        
+        self.assertEqual(len(fig.data[1].text), 11)
+        notes = [annotation.text for annotation in fig.layout.annotations]
+        self.assertFalse(any(note.startswith('Showing top') for note in notes))
+        
+    def test_save_interactive_html_creates_directories(self):
+        """Test that saving a report creates missing parent directories."""
+        for path in (self.tmp_path / 'str' / 'timeline.html',
+                     self.tmp_path / 'path' / 'nested' / 'timeline.html'):
+            with self.subTest(path=path):
+                filename = str(path) if path.parent.name == 'str' else path
+                self.visualizer.save_interactive_html(self.call_data, filename=filename)
+                self.assertTrue(path.exists())
+                
+    def test_json_engine_left_alone(self):
+        """Test that writing a report does not change plotly's global JSON engine."""
+        engine = pio.json.config.default_engine
+        
+        self.visualizer.save_interactive_html(
+            self.call_data,
+            filename=str(self.tmp_path / 'timeline.html')
+        )
+        
+        self.assertEqual(pio.json.config.default_engine, engine)
+
+if __name__ == '__main__':
+    unittest.main()